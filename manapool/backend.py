@@ -0,0 +1,252 @@
+"""Compute backends for the batch operations of manapool.
+
+manapool has no dependencies. When NumPy is installed the batch operations, such as sampling many hands or packs at
+once, are routed to vectorized NumPy kernels instead of the pure Python ones. NumPy is looked for the first time a
+backend is needed, not when manapool is imported.
+
+The backend is picked in this order:
+
+ - the name given to :func:`set_backend`.
+ - the MANAPOOL_BACKEND environment variable, "python" or "numpy".
+ - NumPy if it can be imported, otherwise pure Python.
+
+Both backends give the same results for the deterministic operations. Random operations follow the same distribution,
+but each backend has its own random generator, so the same seed gives different samples on different backends.
+
+The results that are handed on to the callers of manapool, the hypergeometric tables, the sampled packs and their card
+counts, have the same types on both backends: tuples of floats and arrays of the array module. The other results are
+only used within manapool and are NumPy arrays on the NumPy backend.
+"""
+import os
+import random
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from typing import List, Optional, Sequence, Tuple
+
+from .instrument import instrumented
+
+# A slot of a booster pack: the (first id, number of ids) of each rarity, the rarity weights and the number of cards.
+Slot = Tuple[Sequence[Tuple[int, int]], Sequence[float], int]
+
+
+# The number of sort keys the NumPy backend draws at once when sampling hands, which bounds its memory use.
+_SORT_KEYS = 1 << 20
+
+
+class PythonBackend:
+    """The pure Python backend. Random operations use the random module, or a random.Random when given a seed."""
+
+    name = "python"
+
+    def generator(self, seed: Optional[int] = None):
+        return random if seed is None else random.Random(seed)
+
+    @instrumented("backend.hypergeometric_tables")
+    def hypergeometric_tables(self, population: int, successes: Sequence[int], draws: int) -> List[Tuple[float, ...]]:
+        from .calc import hypergeometric_table
+        return [hypergeometric_table(population, k, draws) for k in successes]
+
+    @instrumented("backend.bincount")
+    def bincount(self, ids: Sequence[int], length: int) -> array:
+        result = array("Q", bytes(8 * length))
+        for i, count in Counter(ids).items():
+            result[i] = count
+        return result
+
+    @instrumented("backend.sample_hands")
+    def sample_hands(self, population: int, k: int, n: int, rng) -> Sequence[Sequence[int]]:
+        indices = range(population)
+        return [rng.sample(indices, k) for _ in range(n)]
+
+    @instrumented("backend.count_hits")
+    def count_hits(self, hands: Sequence[Sequence[int]], hits: Sequence[bool]) -> Sequence[int]:
+        return [sum(1 for i in hand if hits[i]) for hand in hands]
+
+    @instrumented("backend.fraction_at_least")
+    def fraction_at_least(self, values: Sequence[int], at_least: int) -> float:
+        return sum(1 for v in values if v >= at_least) / len(values)
+
+    @instrumented("backend.fraction_meeting")
+    def fraction_meeting(self, rows: Sequence[Sequence[int]], checks: Sequence[Tuple[int, int]]) -> float:
+        return sum(1 for row in rows if all(row[i] >= k for i, k in checks)) / len(rows)
+
+    @instrumented("backend.sample_group_counts")
+    def sample_group_counts(self, counts: Sequence[int], k: int, n: int, rng) -> Sequence[Sequence[int]]:
+        # Sample positions in the concatenated groups and look up the group of each position.
+        bounds = list(accumulate(counts))
+        indices = range(bounds[-1] if bounds else 0)
+        result = []
+        for _ in range(n):
+            hand = [0] * len(counts)
+            for i in rng.sample(indices, k):
+                hand[bisect_right(bounds, i)] += 1
+            result.append(hand)
+        return result
+
+    @instrumented("backend.sample_packs")
+    def sample_packs(self, slots: Sequence[Slot], n: int, rng) -> array:
+        pack_size = sum(count for _, _, count in slots)
+        ids = array("I", bytes(4 * n * pack_size))
+        offset = 0
+        for rarities, weights, count in slots:
+            # One rarity per pack and one column of ids per card of the slot, each drawn for the whole batch at once.
+            # Packs with a repeated card are redrawn afterwards. That is most packs when the slot takes a large share of
+            # the rarity, about 93% for 10 of 20 commons and still about 36% for 10 of 101.
+            chosen = rng.choices(rarities, weights, k=n)
+            rand = rng.random
+            columns = [[start + int(rand() * size) for start, size in chosen] for _ in range(count)]
+            if count > 1:
+                for p, row in enumerate(zip(*columns)):
+                    if len(set(row)) < count:
+                        start, size = chosen[p]
+                        for k, i in enumerate(rng.sample(range(size), count)):
+                            columns[k][p] = start + i
+            for k, column in enumerate(columns):
+                ids[offset + k::pack_size] = array("I", column)
+            offset += count
+        return ids
+
+
+class NumpyBackend:
+    """The NumPy backend. Random operations use a numpy.random.Generator."""
+
+    name = "numpy"
+
+    def __init__(self):
+        import numpy
+        self._np = numpy
+
+    def generator(self, seed: Optional[int] = None):
+        return self._np.random.default_rng(seed)
+
+    @instrumented("backend.hypergeometric_tables")
+    def hypergeometric_tables(self, population: int, successes: Sequence[int], draws: int) -> List[Tuple[float, ...]]:
+        from .calc import _check_hypergeometric
+        np = self._np
+        for k in successes:
+            _check_hypergeometric(population, k, draws)
+        # log(i!) for i in [0, population], then every binomial as a difference of those.
+        log_fac = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, population + 1, dtype=np.float64)))))
+
+        def log_binomial(a, b):
+            valid = (b >= 0) & (b <= a)
+            safe_b = np.clip(b, 0, a)
+            return np.where(valid, log_fac[a] - log_fac[safe_b] - log_fac[a - safe_b], -np.inf)
+
+        big_k = np.asarray(successes, dtype=np.int64)[:, None]
+        k = np.arange(0, draws + 1, dtype=np.int64)[None, :]
+        logs = log_binomial(big_k, k) + log_binomial(population - big_k, draws - k) - log_binomial(
+            np.int64(population), np.int64(draws))
+        return [tuple(table) for table in np.exp(logs).tolist()]
+
+    @instrumented("backend.bincount")
+    def bincount(self, ids: Sequence[int], length: int) -> array:
+        np = self._np
+        counts = np.bincount(np.asarray(ids, dtype=np.int64), minlength=length)
+        return array("Q", counts.astype(np.uint64).tobytes())
+
+    @instrumented("backend.sample_hands")
+    def sample_hands(self, population: int, k: int, n: int, rng) -> Sequence[Sequence[int]]:
+        # The positions of the k smallest of population uniform numbers are a uniform sample without replacement. The
+        # sort keys are drawn a chunk of rows at a time, so only the n x k result grows with n.
+        np = self._np
+        hands = np.empty((n, k), dtype=np.int64)
+        step = max(1, _SORT_KEYS // max(population, 1))
+        for start in range(0, n, step):
+            stop = min(start + step, n)
+            hands[start:stop] = np.argsort(rng.random((stop - start, population)), axis=1)[:, :k]
+        return hands
+
+    @instrumented("backend.count_hits")
+    def count_hits(self, hands: Sequence[Sequence[int]], hits: Sequence[bool]) -> Sequence[int]:
+        np = self._np
+        return np.asarray(hits, dtype=bool)[np.asarray(hands, dtype=np.int64)].sum(axis=1)
+
+    @instrumented("backend.fraction_at_least")
+    def fraction_at_least(self, values: Sequence[int], at_least: int) -> float:
+        return float((self._np.asarray(values) >= at_least).mean())
+
+    @instrumented("backend.fraction_meeting")
+    def fraction_meeting(self, rows: Sequence[Sequence[int]], checks: Sequence[Tuple[int, int]]) -> float:
+        np = self._np
+        columns = np.array([i for i, _ in checks], dtype=np.int64)
+        minimums = np.array([k for _, k in checks], dtype=np.int64)
+        return float((np.asarray(rows)[:, columns] >= minimums).all(axis=1).mean())
+
+    @instrumented("backend.sample_group_counts")
+    def sample_group_counts(self, counts: Sequence[int], k: int, n: int, rng) -> Sequence[Sequence[int]]:
+        np = self._np
+        if not len(counts):
+            return np.zeros((n, 0), dtype=np.int64)
+        return rng.multivariate_hypergeometric(np.asarray(counts, dtype=np.int64), k, size=n)
+
+    @instrumented("backend.sample_packs")
+    def sample_packs(self, slots: Sequence[Slot], n: int, rng) -> array:
+        np = self._np
+        pack_size = sum(count for _, _, count in slots)
+        ids = np.empty((n, pack_size), dtype=np.uint32)
+        offset = 0
+        for rarities, weights, count in slots:
+            starts = np.array([start for start, _ in rarities], dtype=np.int64)
+            sizes = np.array([size for _, size in rarities], dtype=np.int64)
+            p = np.asarray(weights, dtype=np.float64)
+            chosen = rng.choice(len(rarities), size=n, p=p / p.sum())
+            block = np.empty((n, count), dtype=np.int64)
+            for r in range(len(rarities)):
+                rows = np.nonzero(chosen == r)[0]
+                if not len(rows):
+                    continue
+                # Floyd's algorithm, run for all the packs of the rarity at once: the k:th pick is uniform in [0, j] and
+                # falls back to j if already picked. Every pack gets count distinct cards without any redraws. The
+                # picks come out biased towards low ids in the first columns, so each pack is shuffled afterwards.
+                size = int(sizes[r])
+                picked = np.empty((len(rows), count), dtype=np.int64)
+                for k, j in enumerate(range(size - count, size)):
+                    t = (rng.random(len(rows)) * (j + 1)).astype(np.int64)
+                    taken = (picked[:, :k] == t[:, None]).any(axis=1)
+                    picked[:, k] = np.where(taken, j, t)
+                block[rows] = starts[r] + rng.permuted(picked, axis=1)
+            ids[:, offset:offset + count] = block
+            offset += count
+        return array("I", ids.tobytes())
+
+
+_BACKENDS = {
+    "python": PythonBackend,
+    "numpy": NumpyBackend,
+}
+
+_forced = None  # type: Optional[str]
+_backend = None
+
+
+def set_backend(name: Optional[str]) -> None:
+    """Forces the backend to use, "python" or "numpy". None goes back to picking it automatically.
+
+    :raises ValueError: unknown backend name.
+    :raises ImportError: "numpy" was asked for but it is not installed.
+    """
+    global _forced, _backend
+    if name is not None and name not in _BACKENDS:
+        raise ValueError("Unknown backend {}.".format(name))
+    _forced = name
+    _backend = _BACKENDS[name]() if name is not None else None
+
+
+def get_backend():
+    """Returns the backend in use, picking it on the first call."""
+    global _backend
+    if _backend is None:
+        name = _forced or os.environ.get("MANAPOOL_BACKEND")
+        if name is not None:
+            if name not in _BACKENDS:
+                raise ValueError("Unknown backend {}.".format(name))
+            _backend = _BACKENDS[name]()
+        else:
+            try:
+                _backend = NumpyBackend()
+            except ImportError:
+                _backend = PythonBackend()
+    return _backend
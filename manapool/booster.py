@@ -0,0 +1,145 @@
+"""Generating booster packs and sealed pools for limited formats.
+
+Packs are sampled many at a time into flat arrays of card ids, the positions of the cards in a :class:`SetList`.
+Decks are only built when a pack or pool is asked for. The sampling runs on the backend of :mod:`manapool.backend`.
+"""
+from array import array
+from typing import Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+from .backend import get_backend
+from .card import Card
+from .deck import Deck
+
+
+class SetList:
+    """The cards of a set grouped by rarity, and the slots of its booster packs.
+
+    Each slot is a mapping of rarity to weight together with how many cards the slot holds. For example a pack with a
+    rare slot that is a mythic one time in eight:
+
+        >>> s = SetList({"common": commons, "uncommon": uncommons, "rare": rares, "mythic": mythics},
+        ...             [({"common": 1}, 10), ({"uncommon": 1}, 3), ({"rare": 7, "mythic": 1}, 1)])
+
+    The rarity of a slot is drawn once per pack. Within a slot a card is never repeated.
+    """
+
+    def __init__(self, rarities: Mapping[str, Sequence[Card]], slots: Sequence[Tuple[Mapping[str, int], int]]):
+        """
+        :param rarities: The cards of each rarity.
+        :param slots: Pairs of (rarity weights, number of cards).
+
+        :raises ValueError:
+        """
+        cards = []
+        ids = {}  # type: Dict[str, Tuple[int, int]]
+        for rarity, members in rarities.items():
+            members = tuple(members)
+            if not members:
+                raise ValueError("Rarity {} has no cards.".format(rarity))
+            for card in members:
+                if not isinstance(card, Card):
+                    raise ValueError("Expected the cards of a rarity to be Card instances.")
+            ids[rarity] = (len(cards), len(members))
+            cards.extend(members)
+
+        if not slots:
+            raise ValueError("Expected at least one slot.")
+        checked = []
+        for weights, count in slots:
+            if not isinstance(count, int) or count < 1:
+                raise ValueError("Slot count must be a positive integer.")
+            weights = dict(weights)
+            if not weights or any(w < 0 for w in weights.values()) or sum(weights.values()) <= 0:
+                raise ValueError("Slot weights must be non-negative with a positive sum.")
+            for rarity in weights:
+                if rarity not in ids:
+                    raise ValueError("Unknown rarity {}.".format(rarity))
+                if weights[rarity] > 0 and ids[rarity][1] < count:
+                    raise ValueError("Rarity {} has fewer cards than its slot.".format(rarity))
+            checked.append((tuple(weights.items()), count))
+
+        self._cards = tuple(cards)
+        self._ids = ids
+        self._slots = tuple(checked)
+
+    @property
+    def cards(self) -> Tuple[Card, ...]:
+        """Every card of the set, the index of a card is its id."""
+        return self._cards
+
+    @property
+    def pack_size(self) -> int:
+        return sum(count for _, count in self._slots)
+
+    def packs(self, n: int, seed: Optional[int] = None) -> "PackBatch":
+        """Samples n packs.
+
+        :param seed: Seeds the random generator of the backend, see :mod:`manapool.backend`. When None, the Python
+            backend uses the functions of the random module.
+        """
+        return PackBatch(self, self._sample(n, seed), self.pack_size)
+
+    def sealed(self, n: int, packs_per_pool: int = 6, seed: Optional[int] = None) -> "PackBatch":
+        """Samples n sealed pools, each opened from packs_per_pool packs."""
+        if not isinstance(packs_per_pool, int) or packs_per_pool < 1:
+            raise ValueError("packs_per_pool must be a positive integer.")
+        return PackBatch(self, self._sample(n * packs_per_pool, seed), self.pack_size * packs_per_pool)
+
+    def _sample(self, n: int, seed: Optional[int]) -> Sequence[int]:
+        if not isinstance(n, int) or n < 0:
+            raise ValueError("n must be an integer >= 0.")
+        slots = [
+            ([self._ids[rarity] for rarity, _ in weights], [w for _, w in weights], count)
+            for weights, count in self._slots
+        ]
+        backend = get_backend()
+        return backend.sample_packs(slots, n, backend.generator(seed))
+
+
+class PackBatch(Sequence[Deck]):
+    """A batch of packs or sealed pools stored as one flat array of card ids.
+
+    Indexing the batch builds the Deck of a single pack or pool. Statistics over the whole batch should work on
+    :attr:`ids` or :meth:`counts` instead, which never create Deck objects.
+    """
+
+    def __init__(self, set_list: SetList, ids: Sequence[int], size: int):
+        self._set = set_list
+        self._ids = ids
+        self._size = size
+
+    @property
+    def ids(self) -> array:
+        """The card ids of every pack or pool, back to back, as an array of typecode "I" on every backend.
+
+        numpy.frombuffer(batch.ids, dtype=numpy.uint32) views them as a NumPy array without copying.
+        """
+        return self._ids
+
+    @property
+    def size(self) -> int:
+        """The number of cards in each pack or pool."""
+        return self._size
+
+    def row(self, i: int) -> array:
+        """The card ids of pack or pool i, as an array of typecode "I"."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("PackBatch index out of range.")
+        return self._ids[i * self._size:(i + 1) * self._size]
+
+    def counts(self) -> array:
+        """How many times each card id occurs over the whole batch, as an array of typecode "Q"."""
+        return get_backend().bincount(self._ids, len(self._set.cards))
+
+    def __len__(self) -> int:
+        return len(self._ids) // self._size if self._size else 0
+
+    def __getitem__(self, i: int) -> Deck:
+        cards = self._set.cards
+        return Deck(*(cards[card_id] for card_id in self.row(i)))
+
+    def __iter__(self) -> Iterator[Deck]:
+        for i in range(len(self)):
+            yield self[i]
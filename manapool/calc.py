@@ -1,9 +1,145 @@
-from math import factorial as fac
+from fractions import Fraction
+from typing import Iterable, List, Sequence, Tuple, Union
 
+from .backend import get_backend
+from .instrument import cached, instrumented
 
+# The probability functions return a float, or a Fraction when called with exact=True.
+Probability = Union[float, Fraction]
+
+
+@cached("calc.binomial", maxsize=65536)
 def binomial(x, y):
-    try:
-        binom = fac(x) // fac(y) // fac(x - y)
-    except ValueError:
-        binom = 0
+    """The binomial coefficient, x choose y. Zero when y is not within [0, x].
+
+    Computed with the multiplicative formula. Results are cached and shared by every caller, which makes the exact
+    probabilities over large pools cheap.
+    """
+    if y < 0 or x < 0 or y > x:
+        return 0
+    y = min(y, x - y)
+    binom = 1
+    for i in range(1, y + 1):
+        binom = binom * (x - y + i) // i
     return binom
+
+
+def _check_hypergeometric(population: int, successes: int, draws: int):
+    if successes < 0 or successes > population:
+        raise ValueError("successes must be within [0, population].")
+    if draws < 0 or draws > population:
+        raise ValueError("draws must be within [0, population].")
+
+
+@cached("calc.hypergeometric_table", maxsize=4096)
+def hypergeometric_table(population: int, successes: int, draws: int,
+                         exact: bool = False) -> Tuple[Probability, ...]:
+    """The probability of drawing exactly k successes in draws cards, for every k in [0, draws].
+
+    Tables are cached, so asking again for the same population, successes and draws is a lookup.
+
+    See :func:`hypergeometric` for the parameters.
+
+    :raises ValueError: successes or draws are not within [0, population].
+    """
+    _check_hypergeometric(population, successes, draws)
+    total = binomial(population, draws)
+    if exact:
+        return tuple(
+            Fraction(binomial(successes, k) * binomial(population - successes, draws - k), total)
+            for k in range(0, draws + 1)
+        )
+    return tuple(
+        binomial(successes, k) * binomial(population - successes, draws - k) / total
+        for k in range(0, draws + 1)
+    )
+
+
+@instrumented("calc.hypergeometric_tables")
+def hypergeometric_tables(population: int, successes: Sequence[int], draws: int,
+                          exact: bool = False) -> Sequence[Sequence[Probability]]:
+    """The tables of :func:`hypergeometric_table` for many success counts at once, computed by the backend of
+    :mod:`manapool.backend`. The result is a list with a tuple of floats per success count on every backend.
+
+    Exact tables are always computed in pure Python.
+
+    :raises ValueError: a success count or draws are not within [0, population].
+    """
+    if exact:
+        return [hypergeometric_table(population, k, draws, exact=True) for k in successes]
+    return get_backend().hypergeometric_tables(population, successes, draws)
+
+
+def hypergeometric(population: int, successes: int, draws: int, k: int, exact: bool = False) -> Probability:
+    """Probability of drawing exactly k successes in draws cards, without replacement.
+
+    :param population: Number of cards to draw from, for example the size of the deck.
+    :param successes: How many of the population that count as a success, for example the number of lands.
+    :param draws: How many cards that are drawn.
+    :param k: The exact number of successes.
+    :param exact: Return a Fraction instead of a float.
+
+    :raises ValueError: successes or draws are not within [0, population].
+    """
+    table = hypergeometric_table(population, successes, draws, exact=exact)
+    if k < 0 or k > draws:
+        return Fraction(0) if exact else 0.0
+    return table[k]
+
+
+def _ways_at_least(population: int, successes: int, draws: int, k: int, total: int) -> int:
+    """The number of hands of draws cards with k or more successes, out of the total."""
+    upper = min(draws, successes)
+    if k <= 0:
+        return total
+    if k > upper:
+        return 0
+    # Sum over whichever tail has the fewer terms.
+    if upper - k < k:
+        return sum(binomial(successes, i) * binomial(population - successes, draws - i) for i in range(k, upper + 1))
+    return total - sum(binomial(successes, i) * binomial(population - successes, draws - i) for i in range(0, k))
+
+
+def at_least(population: int, successes: int, draws: int, k: int, exact: bool = False) -> Probability:
+    """Probability of drawing k or more successes in draws cards, without replacement.
+
+    See :func:`hypergeometric` for the parameters.
+    """
+    if exact:
+        _check_hypergeometric(population, successes, draws)
+        total = binomial(population, draws)
+        return Fraction(_ways_at_least(population, successes, draws, k, total), total)
+    table = hypergeometric_table(population, successes, draws)
+    if k <= 0:
+        return 1.0
+    upper = min(draws, successes)
+    if k > upper:
+        return 0.0
+    # Sum over the tail with the smaller probability, 1.0 minus the larger one would cancel away every digit of a
+    # small result. The tail above the mean is the smaller one.
+    if k * population > draws * successes:
+        return sum(table[k:upper + 1])
+    return 1.0 - sum(table[:k])
+
+
+@instrumented("calc.exact_at_least")
+def exact_at_least(population: int, queries: Iterable[Tuple[int, int, int]]) -> List[Fraction]:
+    """Exact probabilities of :func:`at_least` for many queries on the same population, for example one deck.
+
+    The number of hands of each draw count, the denominator, is computed once and shared by every query with that
+    draw count, and each answer is reduced only once.
+
+    :param population: Number of cards to draw from.
+    :param queries: Tuples of (successes, draws, k), see :func:`at_least`.
+
+    :raises ValueError: a query has successes or draws not within [0, population].
+    """
+    denominators = {}
+    result = []
+    for successes, draws, k in queries:
+        _check_hypergeometric(population, successes, draws)
+        total = denominators.get(draws)
+        if total is None:
+            total = denominators[draws] = binomial(population, draws)
+        result.append(Fraction(_ways_at_least(population, successes, draws, k, total), total))
+    return result
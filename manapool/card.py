@@ -1,6 +1,8 @@
-from typing import Union, Mapping
+from typing import Union, Mapping, Tuple
 from enum import Flag, auto, unique
 
+from .instrument import created, instrumented
+
 
 class _Singleton(type):
     instance = None
@@ -56,6 +58,7 @@ class Color(Flag):
         return [Color.White, Color.Blue, Color.Black, Color.Green, Color.Red]
 
 
+@instrumented("card._parse_mana_cost")
 def _parse_mana_cost(s: str):
     NEXT = 0
     ENTERED_PART = 1
@@ -167,6 +170,7 @@ class ManaCost:
 
         self._colours = colours
         self._hash = hash(tuple(self._colours))
+        created("ManaCost")
 
     def __getitem__(self, item: Color) -> int:
         """Retrieves the cost for the given colour or hybrid, only the exact combination is counted.
@@ -181,6 +185,15 @@ class ManaCost:
             raise ValueError("Expected an flag value of Colour.")
         return self._colours.get(item, 0)
 
+    def items(self) -> Tuple[Tuple[Color, int], ...]:
+        """Returns each colour or hybrid combination of the cost together with its cost, zero costs excluded.
+
+            >>> c = ManaCost({Color.White | Color.Black: 1, Color.White: 1})
+            >>> c.items()
+            ((<Color.White|Black: 5>, 1), (<Color.White: 1>, 1))
+        """
+        return tuple((k, v) for k, v in self._colours.items() if v > 0)
+
     def total(self, c: Color) -> int:
         """Retrieves the sum of all the costs with the given colour, hybrids included.
 
@@ -244,6 +257,14 @@ class ManaCost:
     def __hash__(self):
         return self._hash
 
+    def __getstate__(self):
+        return self._colours, self._converted
+
+    def __setstate__(self, state):
+        # The hash is recomputed, since string hashes differ between processes.
+        self._colours, self._converted = state
+        self._hash = hash(tuple(self._colours))
+
     def __repr__(self):
         """Prints the card in a format suitable for the constructor of ManaCost."""
         pure_mapping = {
@@ -312,6 +333,8 @@ class Card:
             self._mvid = mvid
         else:
             self._mvid = int(mvid)
+        self._hash = None
+        created("Card")
 
     @property
     def title(self) -> str:
@@ -336,4 +359,13 @@ class Card:
         return self.title == other.title and self.cost == other.cost and self.mvid == other.mvid
 
     def __hash__(self):
-        return hash((self.title, self.cost, self.mvid))
+        # Cards are immutable, so the hash is only computed once. Tallying a deck hashes every card.
+        if self._hash is None:
+            self._hash = hash((self.title, self.cost, self.mvid))
+        return self._hash
+
+    def __getstate__(self):
+        # The cached hash is left out, since string hashes differ between processes.
+        state = self.__dict__.copy()
+        state["_hash"] = None
+        return state
@@ -0,0 +1,209 @@
+"""Decks projected onto user-defined categories.
+
+Many questions only care about a handful of categories, such as lands, ramp, draw and interaction, not about the
+individual cards. A :class:`CategoryDeck` keeps only the count of each category, so probabilities and sampling cost the
+same for a 100-card singleton deck or a 540-card cube as for a deck of five categories.
+
+    >>> categories = {Card("Forest"): "lands", Card("Llanowar Elves"): "ramp"}
+    >>> d = project(deck, categories)
+    >>> d.joint({"lands": 2, "ramp": 1}, draws=7)
+"""
+from fractions import Fraction
+from itertools import product
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from . import calc
+from .backend import get_backend
+from .card import Card
+from .deck import Deck
+from .instrument import instrumented
+
+# Maps a card to its category, or to None for the default category.
+Classifier = Union[Mapping[Card, str], Callable[[Card], Optional[str]]]
+
+Categories = Union[str, Iterable[str]]
+
+
+class CategoryDeck:
+    """A deck as counts of categories. Acts immutably."""
+
+    def __init__(self, counts: Mapping[str, int]):
+        """
+        :param counts: The number of cards of each category.
+
+        :raises ValueError: a count is negative or not an integer.
+        """
+        checked = {}
+        for category, count in counts.items():
+            if not isinstance(count, int) or count < 0:
+                raise ValueError("count must be an integer >= 0.")
+            checked[str(category)] = count
+        self._counts = checked
+        self._size = sum(checked.values())
+
+    @property
+    def size(self) -> int:
+        """The number of cards in the deck."""
+        return self._size
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        return tuple(self._counts)
+
+    def count(self, categories: Categories) -> int:
+        """The number of cards of the given category, or of any of the given categories."""
+        if isinstance(categories, str):
+            return self._counts.get(categories, 0)
+        return sum(self._counts.get(c, 0) for c in set(categories))
+
+    def items(self) -> Tuple[Tuple[str, int], ...]:
+        """Pairs of (category, count)."""
+        return tuple(self._counts.items())
+
+    def _check_draws(self, draws: int) -> None:
+        if not isinstance(draws, int) or draws < 0 or draws > self._size:
+            raise ValueError("draws must be an integer within [0, size].")
+
+    def probability(self, categories: Categories, draws: int, at_least: int = 1,
+                    exact: bool = False) -> calc.Probability:
+        """The probability of drawing at least the given number of cards of the categories in draws cards.
+
+        :param categories: A category or an iterable of categories, which are counted together.
+        :param draws: How many cards are drawn.
+        :param at_least: How many cards of the categories that must be drawn.
+        :param exact: Return a Fraction instead of a float.
+
+        :raises ValueError: draws is negative or larger than the deck.
+        """
+        self._check_draws(draws)
+        return calc.at_least(self._size, self.count(categories), draws, at_least, exact=exact)
+
+    def exactly(self, categories: Categories, draws: int, k: int, exact: bool = False) -> calc.Probability:
+        """The probability of drawing exactly k cards of the categories in draws cards.
+
+        See :meth:`probability` for the parameters.
+        """
+        self._check_draws(draws)
+        return calc.hypergeometric(self._size, self.count(categories), draws, k, exact=exact)
+
+    @instrumented("category.CategoryDeck.joint")
+    def joint(self, requirements: Mapping[str, int], draws: int, exact: bool = False) -> calc.Probability:
+        """The probability of drawing at least the required number of cards of every category at once.
+
+        For example the probability of at least two lands and one ramp card in the opening hand:
+
+            >>> d.joint({"lands": 2, "ramp": 1}, draws=7)
+
+        :param requirements: The minimum number of cards of each category.
+        :param draws: How many cards are drawn.
+        :param exact: Return a Fraction instead of a float.
+
+        :raises ValueError: draws is negative or larger than the deck.
+        """
+        self._check_draws(draws)
+        required = [(self._counts.get(c, 0), n) for c, n in requirements.items()]
+        rest = self._size - sum(count for count, _ in required)
+
+        # Every way of drawing enough of each required category, the other cards fill the rest of the draws.
+        ways = 0
+        ranges = (range(max(n, 0), min(count, draws) + 1) for count, n in required)
+        for drawn in product(*ranges):
+            others = draws - sum(drawn)
+            if others < 0 or others > rest:
+                continue
+            w = calc.binomial(rest, others)
+            for x, (count, _) in zip(drawn, required):
+                w *= calc.binomial(count, x)
+            ways += w
+
+        total = calc.binomial(self._size, draws)
+        return Fraction(ways, total) if exact else ways / total
+
+    def _check_sampling(self, n: int, count: int) -> None:
+        if not isinstance(n, int) or n < 0:
+            raise ValueError("n must be an integer >= 0.")
+        self._check_draws(count)
+
+    def _sample(self, n: int, count: int, seed: Optional[int]):
+        backend = get_backend()
+        return backend.sample_group_counts(list(self._counts.values()), count, n, backend.generator(seed))
+
+    def sample(self, n: int, count: int = 7, seed: Optional[int] = None) -> List[List[int]]:
+        """Draws n hands and returns the number of cards of each category in them, in the order of :attr:`categories`.
+
+        The hands are sampled by the backend of :mod:`manapool.backend`, without building any cards. The result is a
+        list of lists on every backend.
+
+        :param n: How many hands to draw.
+        :param count: The size of each hand.
+        :param seed: Seeds the random generator of the backend.
+
+        :raises ValueError: a negative n or count, or count larger than the deck.
+        """
+        self._check_sampling(n, count)
+        hands = self._sample(n, count, seed)
+        return hands if isinstance(hands, list) else hands.tolist()
+
+    def simulate(self, requirements: Mapping[str, int], n: int, count: int = 7, seed: Optional[int] = None) -> float:
+        """Estimates :meth:`joint` by drawing n hands.
+
+        See :meth:`sample` for the parameters.
+        """
+        self._check_sampling(n, count)
+        index = {c: i for i, c in enumerate(self._counts)}
+        if n == 0 or any(k > 0 for c, k in requirements.items() if c not in index):
+            return 0.0
+        checks = [(index[c], k) for c, k in requirements.items() if c in index]
+        return get_backend().fraction_meeting(self._sample(n, count, seed), checks)
+
+    def __eq__(self, other):
+        if not isinstance(other, CategoryDeck):
+            return False
+        return self._counts == other._counts
+
+    def __hash__(self):
+        return hash(tuple(sorted(self._counts.items())))
+
+    def __repr__(self):
+        return "CategoryDeck({})".format(self._counts)
+
+
+@instrumented("category.project")
+def project(cards: Union[Deck, Iterable[Tuple[int, Card]]], classifier: Classifier,
+            default: str = "other") -> CategoryDeck:
+    """Projects a deck onto categories.
+
+    :param cards: A Deck, or pairs of (count, card) such as a decklist, which need not be expanded into a Deck first.
+    :param classifier: A mapping from card to category, or a function taking a card and returning its category. Cards
+        missing from the mapping, or for which the function returns None, go to the default category.
+    :param default: The category of the cards that the classifier does not categorize.
+
+    :raises ValueError: cards has an item of the wrong type.
+    """
+    if isinstance(classifier, Mapping):
+        classify = classifier.get
+    elif callable(classifier):
+        classify = classifier
+    else:
+        raise ValueError("Expected classifier to be a mapping or a function.")
+
+    if isinstance(cards, Deck):
+        # A Deck stores the copies of a card one after another, so a card is only classified once per run.
+        pairs = []
+        for card in cards:
+            if pairs and pairs[-1][1] is card:
+                pairs[-1][0] += 1
+            else:
+                pairs.append([1, card])
+    else:
+        pairs = cards
+
+    counts = {}  # type: Dict[str, int]
+    for count, card in pairs:
+        if not isinstance(card, Card):
+            raise ValueError("Expected pairs of count and Card.")
+        category = classify(card)
+        if category is None:
+            category = default
+        counts[category] = counts.get(category, 0) + int(count)
+    return CategoryDeck(counts)
@@ -0,0 +1,202 @@
+"""Command line interface for computing statistics over many decklists.
+
+Run it with ``python -m manapool``. Every decklist is analysed in a worker process and the results are written to
+stdout as JSON Lines, one object per decklist, in the order the decklists were given. A summary with the throughput
+is written to stderr when all decklists have been processed.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from fractions import Fraction
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from . import calc
+from .card import Card, ManaCost
+from .deck import Deck, tally, curve
+from .decklist import parse_decklist, split_corpus
+
+
+# Each analysis takes the deck, its tally and the parsed options. The tally is shared since most analyses need it.
+
+def analyse_tally(deck: Deck, counts: Sequence[Tuple[Card, int]], options: argparse.Namespace) -> List[Dict]:
+    return [{"title": card.title, "count": count} for card, count in counts]
+
+
+def analyse_curve(deck: Deck, counts: Sequence[Tuple[Card, int]], options: argparse.Namespace) -> Dict[str, int]:
+    return {str(cmc): count for cmc, count in curve(deck)}
+
+
+def _probability(p: calc.Probability) -> Union[float, str]:
+    """Exact probabilities are written as "numerator/denominator" strings, since JSON has no fractions."""
+    return str(p) if isinstance(p, Fraction) else p
+
+
+def analyse_draw(deck: Deck, counts: Sequence[Tuple[Card, int]],
+                 options: argparse.Namespace) -> Dict[str, Union[float, str]]:
+    """Probability of at least one copy of each card in the opening hand."""
+    draws = min(options.hand_size, len(deck))
+    if options.exact:
+        probabilities = calc.exact_at_least(len(deck), ((count, draws, 1) for _, count in counts))
+    else:
+        probabilities = [calc.at_least(len(deck), count, draws, 1) for _, count in counts]
+    return {card.title: _probability(p) for (card, _), p in zip(counts, probabilities)}
+
+
+def analyse_castability(deck: Deck, counts: Sequence[Tuple[Card, int]],
+                        options: argparse.Namespace) -> Dict[str, Union[float, str]]:
+    """Probability of having drawn enough lands to cast each spell on curve.
+
+    The cards without a cost are counted as lands, colours are not taken into account.
+    """
+    lands = sum(count for card, count in counts if not isinstance(card.cost, ManaCost))
+    result = {}
+    for card, count in counts:
+        if not isinstance(card.cost, ManaCost):
+            continue
+        cmc = card.cost.converted
+        draws = min(options.hand_size + max(cmc - 1, 0), len(deck))
+        result[card.title] = _probability(calc.at_least(len(deck), lands, draws, cmc, exact=options.exact))
+    return result
+
+
+ANALYSES = {
+    "tally": analyse_tally,
+    "curve": analyse_curve,
+    "draw": analyse_draw,
+    "castability": analyse_castability,
+}  # type: Dict[str, Callable[[Deck, Sequence[Tuple[Card, int]], argparse.Namespace], object]]
+
+
+def iter_sources(paths: Iterable[str], corpora: Iterable[str], suffix: str) -> Iterator[Tuple[str, str, bool]]:
+    """Lazily yields the decklists to analyse as tuples of (source name, path or decklist text, is a path).
+
+    Files and directories yield paths, so that the workers read the files themselves. Corpora are read line by line and
+    yield the text of each decklist.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(suffix):
+                        full = os.path.join(root, name)
+                        yield full, full, True
+        else:
+            yield path, path, True
+    for corpus in corpora:
+        with open(corpus, encoding="utf-8") as f:
+            for index, text in split_corpus(f):
+                yield "{}:{}".format(corpus, index), text, False
+
+
+def _analyse(job: Tuple[str, str, bool, argparse.Namespace]) -> Tuple[str, bool]:
+    source, payload, is_path, options = job
+    record = {"source": source}
+    try:
+        if is_path:
+            with open(payload, encoding="utf-8") as f:
+                deck = parse_decklist(f)
+        else:
+            deck = parse_decklist(payload)
+        record["cards"] = len(deck)
+        counts = tally(deck)
+        for name in options.analyses:
+            record[name] = ANALYSES[name](deck, counts, options)
+    except (OSError, ValueError) as e:
+        record["error"] = str(e)
+        return json.dumps(record), False
+    return json.dumps(record), True
+
+
+def _jobs(options: argparse.Namespace) -> Iterator[Tuple[str, str, bool, argparse.Namespace]]:
+    for source, payload, is_path in iter_sources(options.paths, options.corpus, options.suffix):
+        yield source, payload, is_path, options
+
+
+def _windowed_imap(pool, func, iterable, window: int, chunksize: int):
+    """Like Pool.imap, but never submits more than window items at a time.
+
+    Pool.imap consumes its whole input up front, which would keep every decklist of a large corpus in memory.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, window))
+        if not batch:
+            return
+        yield from pool.imap(func, batch, chunksize)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m manapool",
+        description="Computes statistics over decklists and writes the results as JSON Lines.")
+    parser.add_argument("paths", nargs="*", help="decklist files or directories of decklists.")
+    parser.add_argument("--corpus", action="append", default=[],
+                        help="a file of decklists separated by lines of '---'. May be given more than once.")
+    parser.add_argument("-a", "--analysis", dest="analyses", action="append", choices=sorted(ANALYSES),
+                        help="an analysis to run, may be given more than once. Defaults to all of them.")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes, 1 analyses in this process. Defaults to the CPU count.")
+    parser.add_argument("--chunksize", type=int, default=64, help="decklists sent to a worker at a time.")
+    parser.add_argument("--hand-size", type=int, default=7, help="size of the opening hand.")
+    parser.add_argument("--exact", action="store_true",
+                        help="write probabilities as exact fractions, \"numerator/denominator\" strings.")
+    parser.add_argument("--suffix", default=".txt", help="suffix of the decklist files in directories.")
+    parser.add_argument("-o", "--output", default="-", help="file to write the results to, defaults to stdout.")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print the summary.")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    if not options.paths and not options.corpus:
+        parser.error("no decklists given.")
+    if options.jobs < 1 or options.chunksize < 1:
+        parser.error("--jobs and --chunksize must be at least 1.")
+    if options.hand_size < 0:
+        parser.error("--hand-size must be at least 0.")
+    # The corpora are read while the results are being written, so check them before any output is produced.
+    for corpus in options.corpus:
+        if not os.path.isfile(corpus) or not os.access(corpus, os.R_OK):
+            parser.error("cannot read corpus file {}.".format(corpus))
+    if options.analyses is None:
+        options.analyses = list(ANALYSES)
+
+    out = sys.stdout if options.output == "-" else open(options.output, "w", encoding="utf-8")
+    decks = 0
+    errors = 0
+    start = time.perf_counter()
+    try:
+        if options.jobs == 1:
+            results = map(_analyse, _jobs(options))
+            pool = None
+        else:
+            pool = multiprocessing.Pool(options.jobs)
+            results = _windowed_imap(pool, _analyse, _jobs(options),
+                                     options.jobs * options.chunksize * 4, options.chunksize)
+        try:
+            for line, ok in results:
+                decks += 1
+                if not ok:
+                    errors += 1
+                out.write(line)
+                out.write("\n")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    if not options.quiet:
+        rate = decks / elapsed if elapsed > 0 else 0.0
+        print("processed {} decklists ({} errors) in {:.3f} s, {:.1f} decklists/s, {} jobs".format(
+            decks, errors, elapsed, rate, options.jobs), file=sys.stderr)
+    return 1 if errors else 0
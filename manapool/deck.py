@@ -1,13 +1,16 @@
 from abc import abstractmethod
-from typing import Sequence, Tuple, Union
+from typing import Callable, Optional, Sequence, Tuple, Union
 
-from .card import Card
+from .backend import get_backend
+from .card import Card, ManaCost
+from .instrument import created, instrumented
 import random
 
 
 class Deck(Tuple[Card]):
     """Represents a Deck. Decks are immutable."""
 
+    @instrumented("deck.Deck.__new__")
     def __new__(cls, *args: Union[Card, Tuple[int, Card]]):
         """
         Creates a new deck from the given cards.
@@ -41,6 +44,7 @@ class Deck(Tuple[Card]):
                 values.extend([card] * count)
             else:
                 raise ValueError("An item of cards was not of a Card type nor a tuple.")
+        created("Deck")
         return super(Deck, cls).__new__(cls, tuple(values))
 
     @property
@@ -48,6 +52,7 @@ class Deck(Tuple[Card]):
         return len(self) == 0
 
 
+@instrumented("deck.tally")
 def tally(deck: Deck) -> Sequence[Tuple[Card, int]]:
     """Tallies a Deck: counts each instance of a card. This is a very basic and useful operation.
 
@@ -69,6 +74,7 @@ def tally(deck: Deck) -> Sequence[Tuple[Card, int]]:
     return tuple((card, count) for card, count in counts.items())
 
 
+@instrumented("deck.opening_hand")
 def opening_hand(deck: Deck, count: int = 7) -> Union[Tuple, Tuple[Card]]:
     """Draws an opening hand from the given deck.
 
@@ -94,3 +100,83 @@ def opening_hand(deck: Deck, count: int = 7) -> Union[Tuple, Tuple[Card]]:
         return ()
 
     return tuple(random.sample(deck, count))
+
+
+@instrumented("deck.curve")
+def curve(deck: Deck) -> Sequence[Tuple[int, int]]:
+    """Computes the mana curve of a Deck: the number of cards for each converted mana cost.
+
+    Cards with an UNKNOWN cost are not part of the curve.
+
+    :raises ValueError: deck is not a Deck.
+
+    :param deck: The deck to compute the curve for.
+    :return: A sequence of tuples, where the first member is the converted mana cost and the second the count. Sorted
+        by converted mana cost.
+    """
+    if not isinstance(deck, Deck):
+        raise ValueError("Expected a Deck.")
+
+    counts = {}
+    for card in deck:
+        if isinstance(card.cost, ManaCost):
+            cmc = card.cost.converted
+            counts[cmc] = counts.get(cmc, 0) + 1
+
+    return tuple(sorted(counts.items()))
+
+
+def _check_sampling(deck: Deck, n: int, count: int):
+    if not isinstance(deck, Deck):
+        raise ValueError("Expected deck to be a Deck.")
+    if not isinstance(n, int) or n < 0:
+        raise ValueError("n must be an integer >= 0.")
+    if not isinstance(count, int) or count < 0:
+        raise ValueError("count must be an integer >= 0.")
+    if len(deck) < count:
+        raise ValueError("count cannot be less than the number of cards in the deck.")
+
+
+@instrumented("deck.opening_hands")
+def opening_hands(deck: Deck, n: int, count: int = 7, seed: Optional[int] = None) -> Tuple[Tuple[Card, ...], ...]:
+    """Draws n opening hands from the given deck at once. Each hand is drawn from the full deck.
+
+    The hands are sampled by the backend of :mod:`manapool.backend`.
+
+    :param deck: the deck to draw from.
+    :param n: how many hands to draw.
+    :param count: the size of each hand, see :func:`opening_hand`.
+    :param seed: seeds the random generator of the backend. When None, the Python backend uses the random module.
+
+    :raise ValueError: a negative n or count, count larger than the deck, or a parameter of the wrong type.
+    """
+    _check_sampling(deck, n, count)
+    backend = get_backend()
+    hands = backend.sample_hands(len(deck), count, n, backend.generator(seed))
+    return tuple(tuple(deck[i] for i in hand) for hand in hands)
+
+
+@instrumented("deck.simulate")
+def simulate(deck: Deck, predicate: Callable[[Card], bool], n: int, count: int = 7, at_least: int = 1,
+             seed: Optional[int] = None) -> float:
+    """Estimates the probability of an opening hand with at least a number of cards matching the predicate, by drawing
+    n hands.
+
+    The hands are never built out of Card objects, the predicate is evaluated once for each distinct card and the
+    hands are counted by the backend of :mod:`manapool.backend`. For a single predicate the exact answer is given by
+    :func:`manapool.calc.at_least`, simulating is for checking that or for building on the sampled hands.
+
+    See :func:`opening_hands` for the other parameters.
+    """
+    _check_sampling(deck, n, count)
+    if n == 0:
+        return 0.0
+    matches = {}
+    hits = []
+    for card in deck:
+        if card not in matches:
+            matches[card] = bool(predicate(card))
+        hits.append(matches[card])
+    backend = get_backend()
+    hands = backend.sample_hands(len(deck), count, n, backend.generator(seed))
+    return backend.fraction_at_least(backend.count_hits(hands, hits), at_least)
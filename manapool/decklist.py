@@ -0,0 +1,73 @@
+import re
+from typing import Iterable, Iterator, Tuple
+
+from .card import Card, ManaCost
+from .deck import Deck
+from .instrument import instrumented
+
+_LINE = re.compile(r"^(?:(\d+)x?\s+)?(.+?)(?:\s+((?:\{[^{}]*\})+))?$")
+
+CORPUS_SEPARATOR = "---"
+
+
+@instrumented("decklist.parse_decklist")
+def parse_decklist(lines: Iterable[str]) -> Deck:
+    """Parses a plain text decklist into a Deck.
+
+    Each non-empty line is a card entry of the following format:
+
+        entry   = [count ["x"] " "] title [" " cost]
+
+    where count defaults to 1 and cost is a mana cost in the format accepted by :class:`ManaCost`. Lines starting with
+    "#" or "//" are comments. For example:
+
+        4 Bonecrusher Giant {2}{R}
+        4x Lightning Bolt {R}
+        20 Mountain
+
+    Cards listed without a cost get an UNKNOWN cost. Since lands have no mana cost, those are the cards treated as
+    lands by the castability analysis of the command line interface.
+
+    :raises ValueError: a line could not be parsed.
+    """
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+
+    entries = []
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if line == "" or line.startswith("#") or line.startswith("//"):
+            continue
+        match = _LINE.match(line)
+        if match is None:
+            raise ValueError("Could not parse line {}: {}".format(number, line))
+        count, title, cost = match.groups()
+        try:
+            card = Card(title, cost=ManaCost(cost)) if cost is not None else Card(title)
+        except ValueError as e:
+            raise ValueError("Could not parse line {}: {}".format(number, e))
+        entries.append((int(count) if count is not None else 1, card))
+
+    return Deck(*entries)
+
+
+def split_corpus(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Splits a corpus of decklists into the text of each decklist, without reading the whole corpus at once.
+
+    Decklists in a corpus are separated by lines consisting only of "---". Empty decklists are skipped.
+
+    :return: An iterator of tuples where the first member is the index of the decklist in the corpus and the second
+        the text of the decklist.
+    """
+    index = 0
+    current = []
+    for line in lines:
+        if line.strip() == CORPUS_SEPARATOR:
+            if any(l.strip() for l in current):
+                yield index, "".join(current)
+                index += 1
+            current = []
+        else:
+            current.append(line)
+    if any(l.strip() for l in current):
+        yield index, "".join(current)
@@ -0,0 +1,228 @@
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .card import Card, Color, ManaCost
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+def _is_hybrid(c: Color) -> bool:
+    return _popcount(c.value) > 1
+
+
+# The positions of the set bits of every byte value.
+_BYTE_BITS = tuple(tuple(i for i in range(8) if b >> i & 1) for b in range(256))
+
+
+def _to_bits(ids: List[int], length: int) -> int:
+    """The bitset of the given ids, built in one pass over a bytearray instead of one big integer OR per id."""
+    data = bytearray((length + 7) // 8)
+    for i in ids:
+        data[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(data, "little")
+
+
+def _from_bits(bits: int) -> List[int]:
+    """The positions of the set bits in ascending order, decoded a byte at a time."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    return [8 * i + j for i, byte in enumerate(data) if byte for j in _BYTE_BITS[byte]]
+
+
+class Selection:
+    """A set of card ids in a :class:`CardIndex`, stored as the bits of an integer. Selections act immutably.
+
+    Selections are combined with the set operators, which resolve to a single integer operation:
+
+        >>> cheap_blue = index.requires(Color.Blue) & index.cmc_at_most(2)
+        >>> cheap_blue.count()
+
+    Selections from different indices may not be combined.
+    """
+    __slots__ = ["_index", "_bits"]
+
+    def __init__(self, index: "CardIndex", bits: int):
+        self._index = index
+        self._bits = bits
+
+    @property
+    def bits(self) -> int:
+        """The bitset, bit i is set if the card with id i is selected."""
+        return self._bits
+
+    def count(self) -> int:
+        """Number of selected cards."""
+        return _popcount(self._bits)
+
+    def ids(self) -> Tuple[int, ...]:
+        """The ids of the selected cards in ascending order."""
+        return tuple(_from_bits(self._bits))
+
+    def cards(self) -> Tuple[Card, ...]:
+        """The selected cards in ascending order of id."""
+        cards = self._index._cards
+        return tuple(cards[i] for i in _from_bits(self._bits))
+
+    def _other(self, other: "Selection") -> int:
+        if not isinstance(other, Selection):
+            raise ValueError("Expected a Selection.")
+        if other._index is not self._index:
+            raise ValueError("Selections must come from the same CardIndex.")
+        return other._bits
+
+    def __and__(self, other: "Selection") -> "Selection":
+        return Selection(self._index, self._bits & self._other(other))
+
+    def __or__(self, other: "Selection") -> "Selection":
+        return Selection(self._index, self._bits | self._other(other))
+
+    def __xor__(self, other: "Selection") -> "Selection":
+        return Selection(self._index, self._bits ^ self._other(other))
+
+    def __sub__(self, other: "Selection") -> "Selection":
+        return Selection(self._index, self._bits & ~self._other(other))
+
+    def __invert__(self) -> "Selection":
+        return Selection(self._index, self._index.all().bits & ~self._bits)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(_from_bits(self._bits))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def __contains__(self, card_id: int) -> bool:
+        return card_id >= 0 and (self._bits >> card_id) & 1 == 1
+
+    def __eq__(self, other):
+        if not isinstance(other, Selection):
+            return False
+        return self._index is other._index and self._bits == other._bits
+
+    def __hash__(self):
+        return hash((id(self._index), self._bits))
+
+    def __repr__(self):
+        return "Selection({})".format(list(self))
+
+
+class CardIndex:
+    """An index over a sequence of cards for fast filtering on mana cost and colour.
+
+    Each card is identified by its position in the sequence, its id. Building the index from a Deck thus gives every
+    copy of a card its own id, so that counts are counts of copies.
+
+    The queries return :class:`Selection` objects, which are composed with integer bit operations without touching
+    the Card objects:
+
+        >>> index = CardIndex(deck)
+        >>> (index.requires(Color.Blue) & index.cmc_at_most(2)).count()
+        >>> index.hybrid(Color.White | Color.Black).ids()
+
+    Cards with an UNKNOWN cost are only part of :meth:`all` and :meth:`unknown_cost`.
+
+    The index is immutable.
+    """
+
+    def __init__(self, cards: Iterable[Card]):
+        """
+        :param cards: The cards to index, for example a Deck.
+
+        :raises ValueError: an item was not a Card.
+        """
+        self._cards = tuple(cards)
+
+        # The ids are collected per key first and each bitset is built once, since growing a big integer bit by bit
+        # copies it every time.
+        symbols = {}  # type: Dict[Color, List[int]]
+        cmc = {}  # type: Dict[int, List[int]]
+        unknown = []  # type: List[int]
+        for i, card in enumerate(self._cards):
+            if not isinstance(card, Card):
+                raise ValueError("Expected a Card.")
+            cost = card.cost
+            if not isinstance(cost, ManaCost):
+                unknown.append(i)
+                continue
+            cmc.setdefault(cost.converted, []).append(i)
+            for symbol, _ in cost.items():
+                symbols.setdefault(symbol, []).append(i)
+
+        n = len(self._cards)
+        self._symbols = {symbol: _to_bits(ids, n) for symbol, ids in symbols.items()}
+        self._cmc = {value: _to_bits(ids, n) for value, ids in cmc.items()}
+        self._unknown = _to_bits(unknown, n)
+        self._all = (1 << len(self._cards)) - 1
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __getitem__(self, card_id: int) -> Card:
+        """Returns the card with the given id."""
+        return self._cards[card_id]
+
+    def all(self) -> Selection:
+        """Selects every card."""
+        return Selection(self, self._all)
+
+    def none(self) -> Selection:
+        """The empty selection."""
+        return Selection(self, 0)
+
+    def unknown_cost(self) -> Selection:
+        """Selects the cards with an UNKNOWN cost."""
+        return Selection(self, self._unknown)
+
+    def requires(self, c: Color) -> Selection:
+        """Selects the cards whose cost includes the given colour, hybrids included.
+
+        This matches the cards where ``card.cost.total(c) > 0``.
+        """
+        if not isinstance(c, Color):
+            raise ValueError("Expected a Color flag.")
+        bits = 0
+        for symbol, symbol_bits in self._symbols.items():
+            if c in symbol:
+                bits |= symbol_bits
+        return Selection(self, bits)
+
+    def hybrid(self, c: Color = None) -> Selection:
+        """Selects the cards with a hybrid cost.
+
+        :param c: If given, only the cards with exactly this hybrid combination, for example White | Black. Otherwise
+            any hybrid combination.
+        """
+        if c is not None:
+            if not isinstance(c, Color):
+                raise ValueError("Expected a Color flag.")
+            if not _is_hybrid(c):
+                raise ValueError("Expected a hybrid combination of colours.")
+            return Selection(self, self._symbols.get(c, 0))
+        bits = 0
+        for symbol, symbol_bits in self._symbols.items():
+            if _is_hybrid(symbol):
+                bits |= symbol_bits
+        return Selection(self, bits)
+
+    def cmc(self, value: int) -> Selection:
+        """Selects the cards with exactly the given converted mana cost."""
+        return Selection(self, self._cmc.get(value, 0))
+
+    def cmc_between(self, low: int, high: int) -> Selection:
+        """Selects the cards with a converted mana cost within [low, high]."""
+        bits = 0
+        for value, value_bits in self._cmc.items():
+            if low <= value <= high:
+                bits |= value_bits
+        return Selection(self, bits)
+
+    def cmc_at_most(self, value: int) -> Selection:
+        """Selects the cards with a converted mana cost of value or less."""
+        return self.cmc_between(0, value)
+
+    def cmc_at_least(self, value: int) -> Selection:
+        """Selects the cards with a converted mana cost of value or more."""
+        return self.cmc_between(value, max(self._cmc, default=value))
@@ -0,0 +1,145 @@
+"""Opt-in instrumentation of the hot paths of manapool.
+
+When enabled, the instrumented functions record their call counts and cumulative time, caches record their hits and
+misses and constructors record the objects they create. When disabled, which is the default, an instrumented function
+costs one extra call and one flag check.
+
+    >>> with instrument.profile() as stats:
+    ...     run_job()
+    >>> stats.to_json()
+
+or, for a whole process, set MANAPOOL_INSTRUMENT=1 or call :func:`enable` and read :func:`snapshot` when done.
+"""
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class Stats:
+    """The counters gathered while instrumentation was enabled."""
+
+    def __init__(self):
+        self.calls = {}  # type: Dict[str, int]
+        self.time = {}  # type: Dict[str, float]
+        self.hits = {}  # type: Dict[str, int]
+        self.misses = {}  # type: Dict[str, int]
+        self.created = {}  # type: Dict[str, int]
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """The counters as plain dicts, keyed by function, cache or type name."""
+        caches = {}
+        for name in sorted(set(self.hits) | set(self.misses)):
+            hits = self.hits.get(name, 0)
+            misses = self.misses.get(name, 0)
+            rate = hits / (hits + misses) if hits + misses else 0.0
+            caches[name] = {"hits": hits, "misses": misses, "hit_rate": rate}
+        return {
+            "functions": {name: {"calls": self.calls[name], "seconds": self.time.get(name, 0.0)}
+                          for name in sorted(self.calls)},
+            "caches": caches,
+            "created": dict(sorted(self.created.items())),
+        }
+
+    def to_json(self, **kwargs) -> str:
+        """The counters of :meth:`to_dict` as JSON. kwargs are passed to json.dumps."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def clear(self) -> None:
+        for counters in (self.calls, self.time, self.hits, self.misses, self.created):
+            counters.clear()
+
+
+_enabled = os.environ.get("MANAPOOL_INSTRUMENT", "") not in ("", "0")
+_stats = Stats()
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def snapshot() -> Dict[str, Dict]:
+    """The counters gathered so far, see :meth:`Stats.to_dict`."""
+    return _stats.to_dict()
+
+
+def reset() -> None:
+    """Clears the counters gathered so far."""
+    _stats.clear()
+
+
+@contextmanager
+def profile() -> Iterator[Stats]:
+    """Enables instrumentation within the block and yields fresh counters for it.
+
+    The counters of an enclosing profile block or of :func:`enable` are restored after the block.
+    """
+    global _enabled, _stats
+    previous_enabled, previous_stats = _enabled, _stats
+    _enabled, _stats = True, Stats()
+    try:
+        yield _stats
+    finally:
+        _enabled, _stats = previous_enabled, previous_stats
+
+
+def instrumented(name: str):
+    """Decorates a function to count its calls and time when instrumentation is enabled."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            stats = _stats
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stats.time[name] = stats.time.get(name, 0.0) + time.perf_counter() - start
+                stats.calls[name] = stats.calls.get(name, 0) + 1
+        return wrapper
+    return decorator
+
+
+def cached(name: str, maxsize: int = 128):
+    """Like functools.lru_cache, but records the hits and misses of the cache when instrumentation is enabled."""
+    def decorator(fn):
+        cached_fn = functools.lru_cache(maxsize=maxsize)(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return cached_fn(*args, **kwargs)
+            hits = cached_fn.cache_info().hits
+            result = cached_fn(*args, **kwargs)
+            cache_lookup(name, cached_fn.cache_info().hits > hits)
+            return result
+        wrapper.cache_info = cached_fn.cache_info
+        wrapper.cache_clear = cached_fn.cache_clear
+        return wrapper
+    return decorator
+
+
+def cache_lookup(name: str, hit: bool) -> None:
+    """Records a hit or a miss of the named cache."""
+    if _enabled:
+        counters = _stats.hits if hit else _stats.misses
+        counters[name] = counters.get(name, 0) + 1
+
+
+def created(name: str, count: int = 1) -> None:
+    """Records that count objects of the named type were created."""
+    if _enabled:
+        _stats.created[name] = _stats.created.get(name, 0) + count
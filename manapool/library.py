@@ -0,0 +1,107 @@
+from typing import Callable, Dict, Iterable, Union
+
+from . import calc
+from .card import Card
+from .deck import Deck, tally
+
+# What to ask the probability of: a card, any of several cards, or any card matching a predicate.
+Target = Union[Card, Iterable[Card], Callable[[Card], bool]]
+
+
+class Library:
+    """The unknown part of a deck during a game, for probabilities conditioned on the cards that have been seen.
+
+    Start from the whole deck and observe cards as they are revealed, for example the opening hand:
+
+        >>> library = Library(deck, observed=hand)
+        >>> library.probability(lambda c: c.cost is UNKNOWN, draws=3)
+        >>> library.observe(top_card)
+
+    Observing a card only updates a count, the probabilities come from the cached tables of
+    :func:`manapool.calc.hypergeometric_table`, so no Deck is ever rebuilt.
+
+    Unlike most of manapool a Library is mutable, use :meth:`copy` to explore what-ifs.
+    """
+
+    def __init__(self, deck: Deck, observed: Iterable[Card] = ()):
+        """
+        :param deck: The whole deck.
+        :param observed: Cards known not to be in the library, such as the hand, cards seen or milled.
+
+        :raises ValueError: deck is not a Deck, or an observed card is not left in the library.
+        """
+        if not isinstance(deck, Deck):
+            raise ValueError("Expected a Deck.")
+        self._counts = dict(tally(deck))  # type: Dict[Card, int]
+        self._size = len(deck)
+        self.observe(*observed)
+
+    @property
+    def size(self) -> int:
+        """The number of unknown cards left."""
+        return self._size
+
+    def remaining(self, card: Card) -> int:
+        """The number of copies of card left in the library."""
+        return self._counts.get(card, 0)
+
+    def observe(self, *cards: Card) -> None:
+        """Removes the given cards from the library. Either every card is removed or none of them.
+
+        :raises ValueError: a card is not a Card or there are not enough copies left in the library.
+        """
+        removed = {}  # type: Dict[Card, int]
+        for card in cards:
+            if not isinstance(card, Card):
+                raise ValueError("Expected a Card.")
+            removed[card] = removed.get(card, 0) + 1
+        for card, count in removed.items():
+            if self._counts.get(card, 0) < count:
+                raise ValueError("Not enough copies of {} left in the library.".format(card.title))
+        for card, count in removed.items():
+            self._counts[card] -= count
+        self._size -= len(cards)
+
+    def copy(self) -> "Library":
+        """A copy that can observe cards independently of this library."""
+        library = Library.__new__(Library)
+        library._counts = dict(self._counts)
+        library._size = self._size
+        return library
+
+    def successes(self, target: Target) -> int:
+        """The number of cards left in the library that count as target."""
+        if isinstance(target, Card):
+            return self._counts.get(target, 0)
+        if callable(target):
+            return sum(count for card, count in self._counts.items() if target(card))
+        cards = set(target)
+        for card in cards:
+            if not isinstance(card, Card):
+                raise ValueError("Expected a Card, cards or a predicate.")
+        return sum(self._counts.get(card, 0) for card in cards)
+
+    def _check_draws(self, draws: int) -> None:
+        if not isinstance(draws, int) or draws < 0 or draws > self._size:
+            raise ValueError("draws must be an integer within [0, size].")
+
+    def probability(self, target: Target, draws: int, at_least: int = 1, exact: bool = False) -> calc.Probability:
+        """The probability of drawing at least the given number of cards counting as target in the next draws cards.
+
+        :param target: A card, an iterable of cards or a predicate taking a card.
+        :param draws: How many cards are drawn from the library.
+        :param at_least: How many of the target that must be drawn.
+        :param exact: Return a Fraction instead of a float.
+
+        :raises ValueError: draws is negative or larger than the library.
+        """
+        self._check_draws(draws)
+        return calc.at_least(self._size, self.successes(target), draws, at_least, exact=exact)
+
+    def exactly(self, target: Target, draws: int, k: int, exact: bool = False) -> calc.Probability:
+        """The probability of drawing exactly k cards counting as target in the next draws cards.
+
+        See :meth:`probability` for the parameters.
+        """
+        self._check_draws(draws)
+        return calc.hypergeometric(self._size, self.successes(target), draws, k, exact=exact)
@@ -0,0 +1,232 @@
+"""Optimizing the land count and the colour sources of a deck.
+
+A mana base is described by the land types available and how many of each the deck plays, the source-count vector.
+Candidates are scored by an objective, by default the average probability of casting each spell on curve.
+"""
+import multiprocessing
+import os
+from fractions import Fraction
+from itertools import product
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import calc
+from .card import Card, Color, ManaCost
+from .deck import Deck, tally
+from .instrument import instrumented
+
+# An objective takes the spells to score as (cost, count) pairs, the lands as (count, produced colours) pairs, the size
+# of the whole deck and the size of the opening hand. The deck may hold spells that are not scored, such as those with
+# an UNKNOWN cost. Higher is better. It must be a module level function so it can be sent to worker processes.
+Objective = Callable[[Sequence[Tuple[ManaCost, int]], Sequence[Tuple[int, Color]], int, int], float]
+
+
+@instrumented("manabase.castability")
+def castability(cost: ManaCost, lands: Sequence[Tuple[int, Color]], deck_size: int, draws: int,
+                exact: bool = False) -> calc.Probability:
+    """Probability of having drawn lands that can pay for the given cost.
+
+    Each land taps for one of the colours it produces. Generic mana can be paid by any land and hybrid costs by a land
+    producing either colour. The probability is exact: a hand can pay the cost if it holds at least as many lands as
+    the converted cost and, for every combination of coloured costs, enough lands producing any of those colours.
+
+    :param cost: The cost to pay.
+    :param lands: The lands in the deck as pairs of (count, colours the land produces).
+    :param deck_size: The size of the deck, lands included.
+    :param draws: How many cards that have been drawn. Clamped to deck_size.
+    :param exact: Return a Fraction instead of a float.
+
+    :raises ValueError: there are more lands than cards in the deck.
+    """
+    land_total = sum(count for count, _ in lands)
+    if land_total > deck_size:
+        raise ValueError("More lands than cards in the deck.")
+    draws = min(draws, deck_size)
+    cmc = cost.converted
+    if cmc == 0:
+        return Fraction(1) if exact else 1.0
+    if cmc > min(draws, land_total):
+        return Fraction(0) if exact else 0.0
+
+    requirements = [(c.value, n) for c, n in cost.items() if c is not Color.Generic]
+    # Every combination of coloured requirements: the colours that can pay for them and how many lands they need.
+    subsets = []
+    for s in range(1, 1 << len(requirements)):
+        mask = 0
+        needed = 0
+        for i, (c, n) in enumerate(requirements):
+            if s & (1 << i):
+                mask |= c
+                needed += n
+        subsets.append((mask, needed))
+
+    # Lands serving the same combinations are interchangeable for this cost, so they are merged into one group.
+    groups = {}  # type: Dict[Tuple[bool, ...], int]
+    for count, produces in lands:
+        signature = tuple(produces.value & mask != 0 for mask, _ in subsets)
+        groups[signature] = groups.get(signature, 0) + count
+    signatures = list(groups)
+    counts = [groups[s] for s in signatures]
+    nonlands = deck_size - land_total
+
+    ways = 0
+    for drawn in product(*(range(0, min(count, draws) + 1) for count in counts)):
+        total = sum(drawn)
+        if total < cmc or total > draws or draws - total > nonlands:
+            continue
+        if any(sum(x for x, s in zip(drawn, signatures) if s[j]) < needed for j, (_, needed) in enumerate(subsets)):
+            continue
+        w = calc.binomial(nonlands, draws - total)
+        for x, count in zip(drawn, counts):
+            w *= calc.binomial(count, x)
+        ways += w
+
+    if exact:
+        return Fraction(ways, calc.binomial(deck_size, draws))
+    return ways / calc.binomial(deck_size, draws)
+
+
+def on_curve(spells: Sequence[Tuple[ManaCost, int]], lands: Sequence[Tuple[int, Color]], deck_size: int,
+             hand_size: int) -> float:
+    """The average probability, weighted by count, of being able to cast each spell on the turn equal to its converted
+    cost, on the play."""
+    total = 0
+    score = 0.0
+    for cost, count in spells:
+        draws = hand_size + max(cost.converted - 1, 0)
+        score += count * castability(cost, lands, deck_size, draws)
+        total += count
+    return score / total if total else 0.0
+
+
+class ManaBase:
+    """The result of :func:`optimize`."""
+
+    def __init__(self, spells: Deck, lands: Sequence[Tuple[int, Card]], score: float, evaluations: int):
+        self._spells = spells
+        self._lands = tuple(lands)
+        self._score = score
+        self._evaluations = evaluations
+
+    @property
+    def lands(self) -> Tuple[Tuple[int, Card], ...]:
+        """Pairs of (count, land), in the order the land types were given."""
+        return self._lands
+
+    @property
+    def land_count(self) -> int:
+        return sum(count for count, _ in self._lands)
+
+    @property
+    def score(self) -> float:
+        """The value of the objective for this mana base."""
+        return self._score
+
+    @property
+    def evaluations(self) -> int:
+        """How many distinct mana bases the search scored."""
+        return self._evaluations
+
+    @property
+    def deck(self) -> Deck:
+        """The spells and the lands together."""
+        return Deck(*self._spells, *self._lands)
+
+    def __repr__(self):
+        return "ManaBase({}, score={})".format(
+            ", ".join("{} {}".format(count, card.title) for count, card in self._lands), self._score)
+
+
+def _evaluate(job) -> float:
+    objective, spells, produces, counts, nonlands, hand_size = job
+    return objective(spells, tuple(zip(counts, produces)), nonlands + sum(counts), hand_size)
+
+
+def _initial_split(land_count: int, types: int) -> Tuple[int, ...]:
+    split = [land_count // types] * types
+    for i in range(land_count % types):
+        split[i] += 1
+    return tuple(split)
+
+
+def _neighbours(counts: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+    """Every split reached by swapping one land for one of another type."""
+    result = []
+    for i, j in product(range(len(counts)), repeat=2):
+        if i != j and counts[i] > 0:
+            moved = list(counts)
+            moved[i] -= 1
+            moved[j] += 1
+            result.append(tuple(moved))
+    return result
+
+
+def optimize(spells: Deck, lands: Sequence[Tuple[Card, Color]], land_counts: Iterable[int],
+             objective: Objective = on_curve, hand_size: int = 7, processes: Optional[int] = None,
+             progress: Optional[Callable[[int, int, float], None]] = None) -> ManaBase:
+    """Searches for the land count and split between land types that maximize the objective.
+
+    For each land count the search starts from an even split and repeatedly swaps one land for another type, as long
+    as that improves the objective. All the swaps of a step are scored in parallel. Scores are memoized by the
+    source-count vector, so no split is scored twice.
+
+    Only spells with a known cost are scored, the others are still part of the deck.
+
+    :param spells: The nonland cards.
+    :param lands: The available land types as pairs of (land, colours the land produces).
+    :param land_counts: The total land counts to try, for example range(15, 19).
+    :param objective: Scores a mana base, higher is better. See :data:`Objective`.
+    :param hand_size: The size of the opening hand.
+    :param processes: Number of worker processes. None uses the CPU count, 1 scores in this process.
+    :param progress: Called after each step of the search with the land count, the number of mana bases scored so far
+        and the best score for the land count.
+
+    :raises ValueError: no land types or land counts, or a parameter of the wrong type.
+    """
+    if not isinstance(spells, Deck):
+        raise ValueError("Expected spells to be a Deck.")
+    lands = tuple(lands)
+    if not lands:
+        raise ValueError("Expected at least one land type.")
+    for card, produces in lands:
+        if not isinstance(card, Card) or not isinstance(produces, Color):
+            raise ValueError("Expected land types as pairs of Card and Color.")
+    land_counts = [int(n) for n in land_counts]
+    if not land_counts or min(land_counts) < 0:
+        raise ValueError("Expected one or more land counts >= 0.")
+
+    costs = tuple((card.cost, count) for card, count in tally(spells) if isinstance(card.cost, ManaCost))
+    produces = tuple(p for _, p in lands)
+    processes = processes or os.cpu_count() or 1
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    memo = {}  # type: Dict[Tuple[int, ...], float]
+
+    def score(candidates: List[Tuple[int, ...]]) -> None:
+        todo = [c for c in dict.fromkeys(candidates) if c not in memo]
+        jobs = [(objective, costs, produces, c, len(spells), hand_size) for c in todo]
+        results = pool.map(_evaluate, jobs) if pool is not None and len(jobs) > 1 else map(_evaluate, jobs)
+        memo.update(zip(todo, results))
+
+    best = None
+    try:
+        for land_count in land_counts:
+            current = _initial_split(land_count, len(lands))
+            score([current])
+            while True:
+                neighbours = _neighbours(current)
+                score(neighbours)
+                candidate = max(neighbours, key=memo.__getitem__, default=current)
+                improved = memo[candidate] > memo[current]
+                if improved:
+                    current = candidate
+                if progress is not None:
+                    progress(land_count, len(memo), memo[current])
+                if not improved:
+                    break
+            if best is None or memo[current] > memo[best]:
+                best = current
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return ManaBase(spells, zip(best, (card for card, _ in lands)), memo[best], len(memo))
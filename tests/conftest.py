@@ -0,0 +1,13 @@
+from manapool import backend
+
+import pytest
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend_name(request):
+    """Runs a test once on each backend, skipping NumPy when it is not installed."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    backend.set_backend(request.param)
+    yield request.param
+    backend.set_backend(None)
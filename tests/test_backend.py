@@ -0,0 +1,145 @@
+from array import array
+
+from manapool import backend, calc, deck
+from manapool.booster import SetList
+from manapool.card import Card
+from manapool.deck import Deck
+
+import pytest
+
+
+def all_backends():
+    names = ["python"]
+    try:
+        import numpy  # noqa: F401
+        names.append("numpy")
+    except ImportError:
+        pass
+    return [backend._BACKENDS[name]() for name in names]
+
+
+def test_set_backend(backend_name):
+    assert (backend.get_backend().name == backend_name)
+    with pytest.raises(ValueError):
+        backend.set_backend("fortran")
+
+
+def test_hypergeometric_tables(backend_name):
+    tables = calc.hypergeometric_tables(60, [0, 1, 4, 24, 60], 7)
+
+    assert (isinstance(tables, list) and all(isinstance(t, tuple) for t in tables))
+    assert (len(tables) == 5)
+    for successes, table in zip([0, 1, 4, 24, 60], tables):
+        expected = calc.hypergeometric_table(60, successes, 7)
+        assert (len(table) == len(expected))
+        for a, b in zip(table, expected):
+            assert (abs(a - b) < 1e-12)
+
+    with pytest.raises(ValueError):
+        calc.hypergeometric_tables(60, [61], 7)
+
+
+def test_opening_hands(backend_name):
+    cards = [Card(str(i)) for i in range(10)]
+    d = Deck(*cards)
+    hands = deck.opening_hands(d, 200, count=4, seed=3)
+
+    assert (len(hands) == 200)
+    for hand in hands:
+        assert (len(hand) == 4)
+        assert (len(set(hand)) == 4)
+        assert (all(c in cards for c in hand))
+    assert (hands == deck.opening_hands(d, 200, count=4, seed=3))
+    assert (deck.opening_hands(d, 3, count=0) == ((), (), ()))
+
+    with pytest.raises(ValueError):
+        deck.opening_hands(d, 1, count=11)
+    with pytest.raises(ValueError):
+        deck.opening_hands(d, -1)
+
+
+def test_sample_hands_chunked(monkeypatch):
+    pytest.importorskip("numpy")
+    # A few rows per chunk, so that n is not a multiple of the chunk size.
+    monkeypatch.setattr(backend, "_SORT_KEYS", 25)
+    numpy_backend = backend.NumpyBackend()
+    hands = numpy_backend.sample_hands(10, 4, 101, numpy_backend.generator(6))
+
+    assert (hands.shape == (101, 4))
+    assert (all(len(set(hand)) == 4 and all(0 <= i < 10 for i in hand) for hand in hands.tolist()))
+    assert (len(set(map(tuple, hands.tolist()))) > 50)
+
+
+def test_simulate(backend_name):
+    d = Deck((24, Card("Island")), (36, Card("Opt")))
+    estimate = deck.simulate(d, lambda c: c.title == "Island", 20000, at_least=3, seed=5)
+
+    assert (abs(estimate - calc.at_least(60, 24, 7, 3)) < 0.02)
+    assert (deck.simulate(d, lambda c: True, 10, at_least=7) == 1.0)
+    assert (deck.simulate(d, lambda c: False, 0) == 0.0)
+
+
+def test_sealed(backend_name):
+    s = SetList({"common": [Card("C{}".format(i)) for i in range(12)], "rare": [Card("R")]},
+                [({"common": 1}, 10), ({"rare": 1}, 1)])
+    batch = s.sealed(300, packs_per_pool=2, seed=9)
+
+    assert (len(batch) == 300)
+    for i in range(len(batch)):
+        row = batch.row(i)
+        assert (len(set(row[:10])) == 10 and len(set(row[11:21])) == 10)
+        assert (row[10] == row[21] == 12)
+    assert (isinstance(batch.ids, array) and isinstance(batch.row(0), array) and isinstance(batch.counts(), array))
+    assert (batch.counts()[12] == 600)
+    assert (batch.ids == s.sealed(300, packs_per_pool=2, seed=9).ids)
+
+
+def test_sealed_full_slot(backend_name):
+    # Every card of the rarity in every pack, which leaves no room for rejecting repeated cards.
+    commons = [Card("C{}".format(i)) for i in range(20)]
+    s = SetList({"common": commons}, [({"common": 1}, 20)])
+    batch = s.packs(200, seed=11)
+
+    for i in range(len(batch)):
+        assert (sorted(batch.row(i)) == list(range(20)))
+
+
+def test_sealed_slot_order(backend_name):
+    # Every position of a slot holds every card of the rarity equally often, not just the set of cards of the slot.
+    s = SetList({"common": [Card("C{}".format(i)) for i in range(10)]}, [({"common": 1}, 5)])
+    batch = s.packs(20000, seed=12)
+
+    for position in (0, 4):
+        counts = [0] * 10
+        for i in range(len(batch)):
+            counts[batch.row(i)[position]] += 1
+        assert (all(abs(c - 2000) < 250 for c in counts))
+
+
+# The deterministic kernels give identical results on every backend.
+
+def test_backends_bincount():
+    ids = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5]
+    results = [b.bincount(ids, 12) for b in all_backends()]
+    assert (results[0] == array("Q", [0, 2, 1, 2, 1, 3, 1, 0, 0, 1, 0, 0]))
+    assert (all(r == results[0] for r in results))
+
+
+def test_backends_fraction_at_least():
+    results = [b.fraction_at_least([0, 3, 1, 2, 5], 2) for b in all_backends()]
+    assert (all(r == 0.6 for r in results))
+
+
+def test_backends_fraction_meeting():
+    rows = [[2, 0, 5], [1, 1, 5], [3, 2, 0], [2, 1, 1]]
+    results = [b.fraction_meeting(rows, [(0, 2), (1, 1)]) for b in all_backends()]
+    assert (all(r == 0.5 for r in results))
+    assert (all(b.fraction_meeting(rows, []) == 1.0 for b in all_backends()))
+
+
+def test_backends_count_hits():
+    hands = [[0, 1, 2], [3, 4, 5], [0, 2, 4]]
+    hits = [True, False, True, False, True, False]
+    results = [list(b.count_hits(hands, hits)) for b in all_backends()]
+    assert (results[0] == [2, 1, 3])
+    assert (all(r == results[0] for r in results))
@@ -0,0 +1,83 @@
+from manapool.booster import SetList
+from manapool.card import Card
+from manapool.deck import Deck
+
+import pytest
+
+
+def make_set():
+    return SetList(
+        {
+            "common": [Card("C{}".format(i)) for i in range(20)],
+            "uncommon": [Card("U{}".format(i)) for i in range(6)],
+            "rare": [Card("R{}".format(i)) for i in range(4)],
+            "mythic": [Card("M{}".format(i)) for i in range(2)],
+        },
+        [({"common": 1}, 10), ({"uncommon": 1}, 3), ({"rare": 3, "mythic": 1}, 1)])
+
+
+def test_setlist_bad_arguments():
+    commons = [Card("C{}".format(i)) for i in range(3)]
+    with pytest.raises(ValueError):
+        SetList({"common": []}, [({"common": 1}, 1)])
+    with pytest.raises(ValueError):
+        SetList({"common": commons}, [])
+    with pytest.raises(ValueError):
+        SetList({"common": commons}, [({"rare": 1}, 1)])
+    with pytest.raises(ValueError):
+        SetList({"common": commons}, [({"common": 1}, 4)])
+    with pytest.raises(ValueError):
+        SetList({"common": commons}, [({"common": 0}, 1)])
+    with pytest.raises(ValueError):
+        SetList({"common": commons}, [({"common": 1}, "2")])
+    with pytest.raises(ValueError):
+        SetList({"common": commons}, [({"common": 1}, 0)])
+    with pytest.raises(ValueError):
+        SetList({"common": ["C1"]}, [({"common": 1}, 1)])
+    with pytest.raises(ValueError):
+        make_set().packs(-1)
+
+
+def test_packs():
+    s = make_set()
+    batch = s.packs(500, seed=1)
+
+    assert (len(batch) == 500)
+    assert (batch.size == s.pack_size == 14)
+    assert (len(batch.ids) == 500 * 14)
+    for i in range(len(batch)):
+        row = batch.row(i)
+        assert (all(0 <= c < 20 for c in row[:10]))
+        assert (len(set(row[:10])) == 10)
+        assert (all(20 <= c < 26 for c in row[10:13]))
+        assert (len(set(row[10:13])) == 3)
+        assert (26 <= row[13] < 32)
+
+    mythics = sum(1 for i in range(len(batch)) if batch.row(i)[13] >= 30)
+    assert (abs(mythics / 500 - 0.25) < 0.08)
+
+    pack = batch[-1]
+    assert (isinstance(pack, Deck))
+    assert (list(pack) == [s.cards[c] for c in batch.row(499)])
+    with pytest.raises(IndexError):
+        batch[500]
+
+
+def test_packs_seeded():
+    s = make_set()
+    assert (s.packs(10, seed=7).ids == s.packs(10, seed=7).ids)
+    assert (len(s.packs(0)) == 0)
+
+
+def test_sealed():
+    s = make_set()
+    batch = s.sealed(20, packs_per_pool=6, seed=2)
+
+    assert (len(batch) == 20)
+    assert (batch.size == 84)
+    assert (len(batch[3]) == 84)
+
+    counts = batch.counts()
+    assert (len(counts) == len(s.cards))
+    assert (sum(counts) == 20 * 84)
+    assert (sum(counts[:20]) == 20 * 60)
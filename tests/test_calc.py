@@ -1,3 +1,8 @@
+import math
+from fractions import Fraction
+
+import pytest
+
 from manapool import calc
 
 
@@ -7,3 +12,79 @@ def test_binomial():
     assert (calc.binomial(5, 1) == 5)
 
     assert (calc.binomial(5, 3) == 10)
+
+
+def test_hypergeometric():
+    assert (calc.hypergeometric(9, 1, 7, 1) == 7 / 9)
+    assert (calc.hypergeometric(9, 1, 7, 2) == 0.0)
+    assert (abs(sum(calc.hypergeometric(60, 24, 7, k) for k in range(0, 8)) - 1.0) < 1e-12)
+
+    with pytest.raises(ValueError):
+        calc.hypergeometric(9, 10, 7, 1)
+    with pytest.raises(ValueError):
+        calc.hypergeometric(9, 1, 10, 1)
+
+
+def test_at_least():
+    assert (calc.at_least(9, 2, 7, 0) == 1.0)
+    assert (abs(calc.at_least(9, 2, 7, 1) - (1 - calc.binomial(7, 7) / calc.binomial(9, 7))) < 1e-12)
+    assert (calc.at_least(9, 2, 7, 3) == 0.0)
+
+    with pytest.raises(ValueError):
+        calc.at_least(9, -1, 7, 0)
+
+
+def test_at_least_upper_tail():
+    # Far above the mean the result is tiny, and must not be computed as 1.0 minus the rest.
+    for args in [(2000, 400, 400, 150), (1000, 100, 200, 50), (60, 24, 7, 6)]:
+        exact = calc.at_least(*args, exact=True)
+        assert (abs(calc.at_least(*args) - float(exact)) <= 1e-9 * float(exact))
+
+
+def test_hypergeometric_table():
+    table = calc.hypergeometric_table(60, 24, 7)
+
+    assert (len(table) == 8)
+    assert (table == tuple(calc.hypergeometric(60, 24, 7, k) for k in range(0, 8)))
+    assert (calc.hypergeometric_table(60, 24, 7) is table)
+
+
+def test_binomial_edges():
+    assert (calc.binomial(5, 6) == 0)
+    assert (calc.binomial(5, -1) == 0)
+    assert (calc.binomial(0, 0) == 1)
+    assert (calc.binomial(540, 45) == math.factorial(540) // math.factorial(45) // math.factorial(495))
+
+
+def test_exact():
+    assert (calc.hypergeometric(9, 1, 7, 1, exact=True) == Fraction(7, 9))
+    assert (calc.hypergeometric(9, 1, 7, 8, exact=True) == 0)
+    assert (isinstance(calc.hypergeometric(9, 1, 7, 8, exact=True), Fraction))
+    assert (sum(calc.hypergeometric_table(60, 24, 7, exact=True)) == 1)
+    assert (calc.at_least(9, 2, 7, 1, exact=True) == 1 - Fraction(calc.binomial(7, 7), calc.binomial(9, 7)))
+    assert (calc.at_least(9, 2, 7, 0, exact=True) == 1)
+    assert (calc.at_least(9, 2, 7, 3, exact=True) == 0)
+
+    for k in range(0, 9):
+        assert (abs(float(calc.at_least(60, 24, 7, k, exact=True)) - calc.at_least(60, 24, 7, k)) < 1e-12)
+
+    with pytest.raises(ValueError):
+        calc.at_least(9, 10, 7, 1, exact=True)
+
+
+def test_exact_at_least():
+    queries = [(24, 7, 1), (24, 7, 3), (4, 10, 1), (0, 7, 1), (60, 7, 7)]
+    result = calc.exact_at_least(60, queries)
+
+    assert (result == [calc.at_least(60, s, d, k, exact=True) for s, d, k in queries])
+    assert (all(isinstance(p, Fraction) for p in result))
+    assert (calc.exact_at_least(60, []) == [])
+
+    with pytest.raises(ValueError):
+        calc.exact_at_least(60, [(61, 7, 1)])
+
+
+def test_hypergeometric_tables_exact():
+    tables = calc.hypergeometric_tables(40, [0, 17], 7, exact=True)
+    assert (tables == [calc.hypergeometric_table(40, 0, 7, exact=True),
+                       calc.hypergeometric_table(40, 17, 7, exact=True)])
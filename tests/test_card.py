@@ -1,6 +1,7 @@
 import pytest
 from manapool.card import Card, UNKNOWN, ManaCost, Color
 import itertools
+import pickle
 
 
 # CARD TESTS
@@ -197,4 +198,21 @@ def test_manacost_repr():
     ]
 
     for expected, case in cases:
-        assert (str(case) == expected)
\ No newline at end of file
+        assert (str(case) == expected)
+
+
+def test_manacost_items():
+    cost = ManaCost({Color.White | Color.Black: 2, Color.Generic: 1, Color.Red: 0})
+    assert (sorted(cost.items(), key=lambda i: i[0].value) == [(Color.White | Color.Black, 2), (Color.Generic, 1)])
+
+    assert (ManaCost("{0}").items() == ())
+
+
+def test_card_pickle():
+    a = Card("Riemann", cost=ManaCost({Color.Blue: 2}), mvid=123)
+    hash(a)
+    b = pickle.loads(pickle.dumps(a))
+
+    assert (a == b)
+    assert (hash(a) == hash(b))
+    assert (hash(a.cost) == hash(b.cost))
@@ -0,0 +1,103 @@
+from fractions import Fraction
+from itertools import combinations
+
+from manapool import calc, instrument
+from manapool.card import Card, ManaCost, UNKNOWN
+from manapool.category import CategoryDeck, project
+from manapool.deck import Deck
+
+import pytest
+
+
+def make_cube():
+    cards = [Card("Forest")] + [Card("Elf {}".format(i), cost=ManaCost("{G}")) for i in range(10)]
+    cards += [Card("Spell {}".format(i), cost=ManaCost("{2}{U}")) for i in range(89)]
+    return Deck((38, cards[0]), *cards[1:])
+
+
+def classify(card):
+    if card.cost is UNKNOWN:
+        return "lands"
+    if card.title.startswith("Elf"):
+        return "ramp"
+    return None
+
+
+def test_project():
+    d = project(make_cube(), classify)
+
+    assert (d.size == 137)
+    assert (dict(d.items()) == {"lands": 38, "ramp": 10, "other": 89})
+    assert (d.count(["lands", "ramp", "lands"]) == 48)
+    assert (d.count("draw") == 0)
+
+    forest = Card("Forest")
+    assert (project([(17, forest), (23, Card("Opt"))], {forest: "lands"}, default="spells") ==
+            CategoryDeck({"lands": 17, "spells": 23}))
+
+
+def test_project_bad_arguments():
+    with pytest.raises(ValueError):
+        project(Deck(), "lands")
+    with pytest.raises(ValueError):
+        project([(1, "Forest")], {})
+    with pytest.raises(ValueError):
+        CategoryDeck({"lands": -1})
+
+
+def test_probability():
+    d = project(make_cube(), classify)
+
+    assert (d.probability("lands", 7, at_least=3) == calc.at_least(137, 38, 7, 3))
+    assert (d.probability(["lands", "ramp"], 7, at_least=3, exact=True) == calc.at_least(137, 48, 7, 3, exact=True))
+    assert (d.exactly("ramp", 7, 1) == calc.hypergeometric(137, 10, 7, 1))
+
+    with pytest.raises(ValueError):
+        d.probability("lands", 138)
+
+
+def test_joint():
+    d = CategoryDeck({"lands": 3, "ramp": 2, "other": 4})
+
+    # Brute force over every hand of four cards.
+    cards = ["lands"] * 3 + ["ramp"] * 2 + ["other"] * 4
+    hands = list(combinations(range(9), 4))
+    expected = Fraction(sum(1 for h in hands if sum(cards[i] == "lands" for i in h) >= 2 and
+                            sum(cards[i] == "ramp" for i in h) >= 1), len(hands))
+
+    assert (d.joint({"lands": 2, "ramp": 1}, 4, exact=True) == expected)
+    assert (abs(d.joint({"lands": 2, "ramp": 1}, 4) - float(expected)) < 1e-12)
+    assert (d.joint({"lands": 2}, 4) == d.probability("lands", 4, at_least=2))
+    assert (d.joint({}, 4) == 1.0)
+    assert (d.joint({"draw": 1}, 4) == 0.0)
+
+
+def test_sample(backend_name):
+    d = project(make_cube(), classify)
+    hands = d.sample(2000, count=7, seed=4)
+
+    assert (isinstance(hands, list) and all(isinstance(hand, list) for hand in hands))
+    assert (len(hands) == 2000)
+    assert (all(sum(hand) == 7 for hand in hands))
+    assert (all(0 <= hand[1] <= 7 for hand in hands))
+    assert (d.sample(0) == [])
+
+    with pytest.raises(ValueError):
+        d.sample(1, count=138)
+
+
+def test_simulate(backend_name):
+    d = project(make_cube(), classify)
+
+    estimate = d.simulate({"lands": 2, "ramp": 1}, 20000, seed=4)
+    assert (abs(estimate - d.joint({"lands": 2, "ramp": 1}, 7)) < 0.02)
+    assert (d.simulate({}, 10) == 1.0)
+
+    # Nothing is sampled when the answer is known up front.
+    with instrument.profile() as stats:
+        assert (d.simulate({"draw": 1}, 10 ** 9) == 0.0)
+        assert (d.simulate({"lands": 1}, 0) == 0.0)
+    assert ("backend.sample_group_counts" not in stats.calls)
+
+    with pytest.raises(ValueError):
+        d.simulate({"lands": 1}, -1)
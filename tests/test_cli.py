@@ -0,0 +1,68 @@
+import json
+
+from manapool.cli import main
+
+import pytest
+
+
+def test_main(tmp_path, capsys):
+    (tmp_path / "decks").mkdir()
+    (tmp_path / "decks" / "burn.txt").write_text("4 Lightning Bolt {R}\n4 Mountain\n")
+    (tmp_path / "decks" / "broken.txt").write_text("4 Lightning Bolt {Q}\n")
+    (tmp_path / "decks" / "ignored.dec").write_text("4 Lightning Bolt {R}\n")
+    (tmp_path / "corpus.txt").write_text("2 Opt {U}\n2 Island\n---\n1 Island\n")
+
+    code = main([str(tmp_path / "decks"), "--corpus", str(tmp_path / "corpus.txt"), "-j", "1",
+                 "-a", "curve", "-a", "castability"])
+    out, err = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+
+    assert (code == 1)
+    assert ([r["source"] for r in records] == [
+        str(tmp_path / "decks" / "broken.txt"),
+        str(tmp_path / "decks" / "burn.txt"),
+        str(tmp_path / "corpus.txt") + ":0",
+        str(tmp_path / "corpus.txt") + ":1",
+    ])
+    assert ("error" in records[0])
+    assert (records[1] == {"source": str(tmp_path / "decks" / "burn.txt"), "cards": 8,
+                           "curve": {"1": 4}, "castability": {"Lightning Bolt": 1.0}})
+    assert (records[3]["cards"] == 1)
+    assert ("processed 4 decklists (1 errors)" in err)
+
+
+def test_main_exact(tmp_path, capsys):
+    (tmp_path / "burn.txt").write_text("4 Lightning Bolt {R}\n4 Mountain\n")
+
+    assert (main([str(tmp_path / "burn.txt"), "-j", "1", "-q", "--exact", "--hand-size", "1", "-a", "draw"]) == 0)
+    out, _ = capsys.readouterr()
+
+    assert (json.loads(out)["draw"] == {"Lightning Bolt": "1/2", "Mountain": "1/2"})
+
+
+def test_main_parallel(tmp_path, capsys):
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("---\n".join("{} Opt {{U}}\n{} Island\n".format(i, 10 - i) for i in range(1, 10)))
+
+    assert (main(["--corpus", str(corpus), "-j", "1", "-q"]) == 0)
+    serial, _ = capsys.readouterr()
+    assert (main(["--corpus", str(corpus), "-j", "2", "--chunksize", "1", "-q"]) == 0)
+    parallel, _ = capsys.readouterr()
+
+    assert (serial == parallel)
+    assert (len(serial.splitlines()) == 9)
+
+
+def test_main_bad_arguments(tmp_path, capsys):
+    (tmp_path / "burn.txt").write_text("4 Lightning Bolt {R}\n4 Mountain\n")
+
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "burn.txt"), "--corpus", str(tmp_path / "missing.txt"), "-j", "1"])
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "burn.txt"), "--hand-size", "-1", "-j", "1"])
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "burn.txt"), "-j", "0"])
+    out, err = capsys.readouterr()
+
+    assert (out == "")
+    assert ("missing.txt" in err)
@@ -1,4 +1,5 @@
 from manapool.deck import Deck, Card
+from manapool.card import ManaCost
 from manapool import deck, calc
 
 import pytest
@@ -97,6 +98,24 @@ def test_tally():
     assert ((Card("Gauss"), 1) in t)
 
 
+# CURVE TESTS
+
+def test_curve_bad_arguments():
+    with pytest.raises(ValueError):
+        deck.curve(None)
+
+
+def test_curve():
+    d = Deck(
+        (4, Card("Shock", cost=ManaCost("{R}"))),
+        (2, Card("Opt", cost=ManaCost("{U}"))),
+        (3, Card("Cavalier of Flame", cost=ManaCost("{2}{R}{R}"))),
+        (20, Card("Mountain")))
+
+    assert (deck.curve(d) == ((1, 6), (4, 3)))
+    assert (deck.curve(Deck()) == ())
+
+
 # OPENING_HAND TESTS
 
 def test_opening_hand_bad_arguments():
@@ -0,0 +1,40 @@
+from manapool.card import Card, ManaCost
+from manapool.deck import Deck
+from manapool.decklist import parse_decklist, split_corpus
+
+import pytest
+
+
+def test_parse_decklist():
+    d = parse_decklist([
+        "# a comment",
+        "4 Bonecrusher Giant {2}{R}",
+        "",
+        "4x Lightning Bolt {R}",
+        "// another comment",
+        "Sol Ring {1}",
+        "20 Mountain",
+    ])
+
+    bolt = Card("Lightning Bolt", cost=ManaCost("{R}"))
+    assert (len(d) == 29)
+    assert (d.count(Card("Bonecrusher Giant", cost=ManaCost("{2}{R}"))) == 4)
+    assert (d.count(bolt) == 4)
+    assert (d.count(Card("Sol Ring", cost=ManaCost("{1}"))) == 1)
+    assert (d.count(Card("Mountain")) == 20)
+
+
+def test_parse_decklist_str():
+    assert (parse_decklist("2 Opt {U}\n1 Island") == Deck((2, Card("Opt", cost=ManaCost("{U}"))), Card("Island")))
+    assert (parse_decklist("") == Deck())
+
+
+def test_parse_decklist_bad_cost():
+    with pytest.raises(ValueError):
+        parse_decklist(["4 Lightning Bolt {Q}"])
+
+
+def test_split_corpus():
+    lines = ["2 Opt {U}\n", "10 Island\n", "---\n", "---\n", "3 Shock {R}\n", "---\n", "\n"]
+
+    assert (list(split_corpus(lines)) == [(0, "2 Opt {U}\n10 Island\n"), (1, "3 Shock {R}\n")])
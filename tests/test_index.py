@@ -0,0 +1,90 @@
+from manapool.card import Card, Color, ManaCost
+from manapool.deck import Deck
+from manapool.index import CardIndex
+
+import pytest
+
+
+def make_index():
+    return CardIndex(Deck(
+        Card("Opt", cost=ManaCost("{U}")),
+        (2, Card("Counterspell", cost=ManaCost("{U}{U}"))),
+        Card("Kitchen Finks", cost=ManaCost({Color.Green | Color.White: 2, Color.Generic: 1})),
+        Card("Revitalize", cost=ManaCost("{1}{W}")),
+        Card("Zealous Persecution", cost=ManaCost({Color.White | Color.Black: 2})),
+        Card("Island"),
+        Card("Ornithopter", cost=ManaCost("{0}")),
+    ))
+
+
+def test_index_bad_arguments():
+    with pytest.raises(ValueError):
+        CardIndex([Card("Island"), "Island"])
+    index = make_index()
+    with pytest.raises(ValueError):
+        index.requires("U")
+    with pytest.raises(ValueError):
+        index.hybrid(Color.White)
+    with pytest.raises(ValueError):
+        index.all() & CardIndex([]).all()
+
+
+def test_index_requires():
+    index = make_index()
+
+    assert (index.requires(Color.Blue).ids() == (0, 1, 2))
+    assert (index.requires(Color.White).ids() == (3, 4, 5))
+    assert (index.requires(Color.Generic).ids() == (3, 4))
+    assert (index.requires(Color.Red).ids() == ())
+
+    for c in Color:
+        expected = tuple(i for i in range(len(index))
+                         if isinstance(index[i].cost, ManaCost) and index[i].cost.total(c) > 0)
+        assert (index.requires(c).ids() == expected)
+
+
+def test_index_cmc():
+    index = make_index()
+
+    assert (index.cmc(2).ids() == (1, 2, 4, 5))
+    assert (index.cmc_at_most(1).ids() == (0, 7))
+    assert (index.cmc_at_least(3).ids() == (3,))
+    assert (index.cmc_between(1, 2).count() == 5)
+
+
+def test_index_hybrid():
+    index = make_index()
+
+    assert (index.hybrid().ids() == (3, 5))
+    assert (index.hybrid(Color.White | Color.Black).cards() == (Card("Zealous Persecution",
+                                                                      cost=ManaCost({Color.White | Color.Black: 2})),))
+    assert (index.hybrid(Color.Blue | Color.Red).ids() == ())
+
+
+def test_selection_operators():
+    index = make_index()
+    blue = index.requires(Color.Blue)
+    cheap = index.cmc_at_most(1)
+
+    assert ((blue & cheap).ids() == (0,))
+    assert ((blue | cheap).ids() == (0, 1, 2, 7))
+    assert ((blue - cheap).ids() == (1, 2))
+    assert ((blue ^ cheap).ids() == (1, 2, 7))
+    assert ((~blue).ids() == (3, 4, 5, 6, 7))
+    assert (index.unknown_cost().ids() == (6,))
+    assert (len(index.all()) == 8)
+    assert (not index.none())
+    assert (2 in blue and 3 not in blue)
+
+
+def test_index_large():
+    cards = [Card("Opt", cost=ManaCost("{U}")), Card("Island"), Card("Shock", cost=ManaCost("{R}"))]
+    index = CardIndex(cards[i % 7 % 3] for i in range(20000))
+
+    blue = index.requires(Color.Blue)
+    assert (blue.ids() == tuple(i for i in range(20000) if i % 7 % 3 == 0))
+    assert (list(blue) == list(blue.ids()))
+    assert (blue.count() == len(blue.ids()))
+    assert (index.unknown_cost().ids() == tuple(i for i in range(20000) if i % 7 % 3 == 1))
+    assert (index.cmc(1).bits == index.all().bits & ~index.unknown_cost().bits)
+    assert (index.none().ids() == ())
@@ -0,0 +1,50 @@
+import json
+
+from manapool import calc, deck, instrument
+from manapool.card import Card, ManaCost
+from manapool.deck import Deck
+
+
+def test_disabled_by_default():
+    instrument.reset()
+    deck.tally(Deck(Card("Riemann")))
+
+    assert (not instrument.enabled())
+    assert (instrument.snapshot() == {"functions": {}, "caches": {}, "created": {}})
+
+
+def test_profile():
+    calc.hypergeometric_table.cache_clear()
+    with instrument.profile() as stats:
+        d = Deck((3, Card("Opt", cost=ManaCost("{U}"))), Card("Island"))
+        deck.tally(d)
+        deck.tally(d)
+        calc.at_least(60, 24, 7, 2)
+        calc.at_least(60, 24, 7, 3)
+    deck.tally(d)
+
+    result = stats.to_dict()
+    assert (result["functions"]["deck.tally"]["calls"] == 2)
+    assert (result["functions"]["deck.tally"]["seconds"] >= 0.0)
+    assert (result["functions"]["card._parse_mana_cost"]["calls"] == 1)
+    assert (result["functions"]["deck.Deck.__new__"]["calls"] == 1)
+    assert (result["caches"]["calc.hypergeometric_table"] == {"hits": 1, "misses": 1, "hit_rate": 0.5})
+    assert (result["created"] == {"Card": 2, "Deck": 1, "ManaCost": 1})
+    assert (json.loads(stats.to_json()) == result)
+    assert (not instrument.enabled())
+
+
+def test_enable():
+    instrument.reset()
+    instrument.enable()
+    try:
+        with instrument.profile() as inner:
+            deck.tally(Deck())
+        deck.curve(Deck())
+    finally:
+        instrument.disable()
+
+    assert (list(inner.to_dict()["functions"]) == ["deck.Deck.__new__", "deck.tally"])
+    assert (list(instrument.snapshot()["functions"]) == ["deck.Deck.__new__", "deck.curve"])
+    instrument.reset()
+    assert (instrument.snapshot()["functions"] == {})
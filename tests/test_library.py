@@ -0,0 +1,77 @@
+from fractions import Fraction
+
+from manapool import calc
+from manapool.card import Card, ManaCost, UNKNOWN
+from manapool.deck import Deck
+from manapool.library import Library
+
+import pytest
+
+island = Card("Island")
+opt = Card("Opt", cost=ManaCost("{U}"))
+counterspell = Card("Counterspell", cost=ManaCost("{U}{U}"))
+
+
+def make_deck():
+    return Deck((17, island), (4, opt), (19, counterspell))
+
+
+def test_library_bad_arguments():
+    with pytest.raises(ValueError):
+        Library(None)
+    with pytest.raises(ValueError):
+        Library(make_deck(), observed=[Card("Mountain")])
+    library = Library(make_deck())
+    with pytest.raises(ValueError):
+        library.observe("Island")
+    with pytest.raises(ValueError):
+        library.probability(island, 41)
+    with pytest.raises(ValueError):
+        library.probability([island, "Opt"], 1)
+
+
+def test_library_observe():
+    library = Library(make_deck(), observed=[island, island, opt])
+
+    assert (library.size == 37)
+    assert (library.remaining(island) == 15)
+    assert (library.remaining(opt) == 3)
+    assert (library.remaining(Card("Mountain")) == 0)
+
+    with pytest.raises(ValueError):
+        library.observe(opt, opt, opt, opt)
+    assert (library.remaining(opt) == 3)
+    assert (library.size == 37)
+
+
+def test_library_probability():
+    hand = [island, island, opt, counterspell, counterspell, counterspell, counterspell]
+    library = Library(make_deck(), observed=hand)
+
+    expected = calc.at_least(33, 15, 3, 1)
+    assert (library.probability(island, 3) == expected)
+    assert (library.probability(lambda c: c.cost is UNKNOWN, 3) == expected)
+    assert (library.probability([island, opt], 2, at_least=2) == calc.at_least(33, 18, 2, 2))
+    assert (library.exactly(opt, 5, 1) == calc.hypergeometric(33, 3, 5, 1))
+    assert (library.successes([opt, opt]) == 3)
+
+    # The same result as rebuilding the deck without the hand.
+    rebuilt = Library(Deck((15, island), (3, opt), (15, counterspell)))
+    assert (library.probability(opt, 4, at_least=2) == rebuilt.probability(opt, 4, at_least=2))
+
+
+def test_library_exact():
+    library = Library(make_deck(), observed=[island, opt])
+
+    assert (library.probability(opt, 3, exact=True) == calc.at_least(38, 3, 3, 1, exact=True))
+    assert (library.exactly(island, 2, 2, exact=True) == Fraction(16 * 15, 38 * 37))
+
+
+def test_library_copy():
+    library = Library(make_deck())
+    other = library.copy()
+    other.observe(opt)
+
+    assert (library.remaining(opt) == 4)
+    assert (other.remaining(opt) == 3)
+    assert (other.size == library.size - 1)
@@ -0,0 +1,107 @@
+from fractions import Fraction
+from itertools import combinations
+
+from manapool import calc
+from manapool.card import Card, Color, ManaCost
+from manapool.deck import Deck
+from manapool import manabase
+
+import pytest
+
+
+def brute_castability(cost, lands, deck_size, draws):
+    """Enumerates every hand, with a greedy payment that is exact for lands producing a single colour."""
+    cards = []
+    for count, produces in lands:
+        cards.extend([produces] * count)
+    cards.extend([None] * (deck_size - len(cards)))
+    castable = 0
+    for hand in combinations(range(deck_size), draws):
+        drawn = [cards[i] for i in hand if cards[i] is not None]
+        ok = len(drawn) >= cost.converted
+        for c in Color.pure():
+            ok = ok and sum(1 for p in drawn if p is c) >= cost[c]
+        castable += ok
+    return castable / calc.binomial(deck_size, draws)
+
+
+def test_castability():
+    lands = [(3, Color.Blue), (2, Color.Red)]
+    for text in ["{U}", "{U}{U}", "{1}{R}", "{U}{R}", "{2}{U}{U}", "{R}{R}{R}"]:
+        cost = ManaCost(text)
+        for draws in range(0, 8):
+            expected = brute_castability(cost, lands, 12, draws)
+            assert (abs(manabase.castability(cost, lands, 12, draws) - expected) < 1e-12)
+
+
+def test_castability_dual_and_hybrid():
+    # A single dual land can only pay for one of the two colours.
+    lands = [(1, Color.Blue | Color.Red)]
+    assert (manabase.castability(ManaCost("{U}{R}"), lands, 2, 2) == 0.0)
+    assert (manabase.castability(ManaCost("{U}"), lands, 2, 1) == 0.5)
+
+    lands = [(1, Color.Blue | Color.Red), (1, Color.Red)]
+    assert (manabase.castability(ManaCost("{U}{R}"), lands, 2, 2) == 1.0)
+
+    hybrid = ManaCost({Color.Blue | Color.Red: 2})
+    assert (manabase.castability(hybrid, [(1, Color.Blue), (1, Color.Red)], 3, 3) == 1.0)
+    assert (manabase.castability(hybrid, [(1, Color.Blue), (1, Color.Green)], 3, 3) == 0.0)
+
+    with pytest.raises(ValueError):
+        manabase.castability(ManaCost("{U}"), [(3, Color.Blue)], 2, 1)
+
+
+def test_castability_exact():
+    lands = [(3, Color.Blue), (2, Color.Red)]
+    for text in ["{0}", "{U}", "{U}{R}", "{R}{R}{R}"]:
+        cost = ManaCost(text)
+        exact = manabase.castability(cost, lands, 12, 5, exact=True)
+        assert (isinstance(exact, Fraction))
+        assert (abs(float(exact) - manabase.castability(cost, lands, 12, 5)) < 1e-12)
+    assert (manabase.castability(ManaCost("{U}"), [(3, Color.Blue)], 12, 1, exact=True) == Fraction(1, 4))
+
+
+def test_optimize():
+    spells = Deck((12, Card("Opt", cost=ManaCost("{U}"))),
+                  (8, Card("Counterspell", cost=ManaCost("{U}{U}"))),
+                  (4, Card("Shock", cost=ManaCost("{R}"))))
+    island = Card("Island")
+    mountain = Card("Mountain")
+    seen = []
+
+    result = manabase.optimize(spells, [(island, Color.Blue), (mountain, Color.Red)], [14, 16], processes=1,
+                               progress=lambda *args: seen.append(args))
+
+    assert (result.land_count == 16)
+    counts = dict((card, count) for count, card in result.lands)
+    assert (counts[island] > counts[mountain] > 0)
+    assert (len(result.deck) == 40)
+    assert (seen[-1][0] == 16 and seen[-1][2] == result.score)
+    assert (result.score == manabase.on_curve(
+        [(c.cost, n) for c, n in [(Card("Opt", cost=ManaCost("{U}")), 12),
+                                  (Card("Counterspell", cost=ManaCost("{U}{U}")), 8),
+                                  (Card("Shock", cost=ManaCost("{R}")), 4)]],
+        [(counts[island], Color.Blue), (counts[mountain], Color.Red)], 40, 7))
+
+    parallel = manabase.optimize(spells, [(island, Color.Blue), (mountain, Color.Red)], [14, 16], processes=2)
+    assert (parallel.lands == result.lands)
+    assert (parallel.score == result.score)
+
+
+def test_optimize_unknown_costs():
+    # The spells without a cost are not scored, but they still take up room in the deck.
+    spells = Deck((4, Card("Opt", cost=ManaCost("{U}"))), (20, Card("Mystery")))
+
+    result = manabase.optimize(spells, [(Card("Island"), Color.Blue)], [16], processes=1)
+
+    assert (len(result.deck) == 40)
+    assert (abs(result.score - calc.at_least(40, 16, 7, 1)) < 1e-12)
+
+
+def test_optimize_bad_arguments():
+    with pytest.raises(ValueError):
+        manabase.optimize(Deck(), [], [16])
+    with pytest.raises(ValueError):
+        manabase.optimize(Deck(), [(Card("Island"), "U")], [16])
+    with pytest.raises(ValueError):
+        manabase.optimize(Deck(), [(Card("Island"), Color.Blue)], [])